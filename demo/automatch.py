@@ -3,22 +3,19 @@ import tinder
 
 
 class Client(tinder.Client):
-    teaser_ids = set()
-
     async def get_teasers(self):
         while True:
-            teasers = await self.fetch_teasers()
-            self.teaser_ids |= {teaser.id for teaser in teasers}
+            await self.fetch_teasers()
             await asyncio.sleep(60)
 
     async def get_recs(self):
         while True:
             users = await self.fetch_recs()
             print(f"fetched {len(users)} users")
-            for user in users:
-                photo_ids = {photo.id for photo in user.photos}
-                if not self.teaser_ids.isdisjoint(photo_ids):
-                    await user.like()
+            matched = [user for user in users if user.matches_teaser()]
+            async for user, result in self.like_many(matched):
+                if isinstance(result, Exception):
+                    print(f"failed to like {user}: {result}")
             await asyncio.sleep(60)
 
     async def main(self):
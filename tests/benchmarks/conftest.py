@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+import tinder
+from tests.fakeserver import FakeTinder
+
+
+@pytest.fixture(scope="module")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def server(loop):
+    server = FakeTinder(recs=20, matches=300)
+    loop.run_until_complete(server.start())
+    yield server
+    loop.run_until_complete(server.close())
+
+
+@pytest.fixture(scope="module")
+def client(loop, server):
+    client = tinder.Client(loop=loop)
+    loop.run_until_complete(client.login("token"))
+    yield client
+    loop.run_until_complete(client.close())
@@ -0,0 +1,39 @@
+"""Throughput of the client against the local fake API.
+
+Run with ``pytest tests/benchmarks --benchmark-only``; compare runs with
+``--benchmark-autosave`` and ``--benchmark-compare``.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_fetch_recs(benchmark, loop, client):
+    users = benchmark(lambda: loop.run_until_complete(client.fetch_recs()))
+    assert len(users) == 20
+
+
+def test_like_fan_out(benchmark, loop, client):
+    users = loop.run_until_complete(client.fetch_recs())
+
+    async def like_all():
+        return [result async for result in client.like_many(users, concurrency=8)]
+
+    results = benchmark(lambda: loop.run_until_complete(like_all()))
+    assert len(results) == len(users)
+
+
+def test_matches_pagination(benchmark, loop, client):
+    async def all_matches():
+        return [match async for match in client.matches()]
+
+    matches = benchmark(lambda: loop.run_until_complete(all_matches()))
+    assert len(matches) == 300
+
+
+def test_dispatch_without_handlers(benchmark, client):
+    def dispatch():
+        for _ in range(1000):
+            client.dispatch("gateway_message", None)
+
+    benchmark(dispatch)
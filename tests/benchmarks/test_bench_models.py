@@ -0,0 +1,62 @@
+"""Model construction and gateway frame handling, without any I/O."""
+import pytest
+
+from tests.fakeserver import make_match, make_user
+from tinder.gateway import HEARTBEAT, GatewayMessage
+from tinder.models import User
+from tinder.state import ConnectionState
+
+pytest.importorskip("pytest_benchmark")
+
+PAYLOADS = [make_user(i) for i in range(100)]
+
+
+def make_state():
+    return ConnectionState(dispatch=lambda *args: None, handlers={}, http=None, loop=None)
+
+
+def test_user_construction(benchmark):
+    state = make_state()
+    users = benchmark(lambda: [User(state, data=data) for data in PAYLOADS])
+    assert len(users) == 100
+
+
+def test_user_photos(benchmark):
+    state = make_state()
+
+    def build():
+        return [User(state, data=data).photos[0].rendition("320x400") for data in PAYLOADS]
+
+    assert len(benchmark(build)) == 100
+
+
+def test_store_users(benchmark):
+    state = make_state()
+    users = [User(state, data=data) for data in PAYLOADS]
+    benchmark(lambda: [state.store_user(user) for user in users])
+    assert state.get_user(PAYLOADS[0]["_id"]) is not None
+
+
+def test_store_matches(benchmark):
+    state = make_state()
+    payloads = [make_match(i) for i in range(100)]
+    benchmark(lambda: [state.store_match(data) for data in payloads])
+
+
+def test_gateway_frames(benchmark):
+    state = make_state()
+    nudge = bytes.fromhex("0a0c08011208") + b"abcdefgh"
+
+    def handle():
+        for frame in (HEARTBEAT, nudge) * 50:
+            state.parse_gateway_message(GatewayMessage(frame))
+
+    benchmark(handle)
+
+
+def test_user_columns_add(benchmark):
+    from tinder.columns import UserColumns
+
+    columns = UserColumns()
+    benchmark(lambda: [columns.add(data) for data in PAYLOADS])
+    assert len(columns) == 100
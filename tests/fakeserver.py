@@ -0,0 +1,248 @@
+"""A local fake of the Tinder API used by the tests and benchmarks.
+
+It serves canned but realistically shaped payloads, with optional latency and
+error injection, and redirects :class:`tinder.http.Route` and the gateway to
+itself while it runs::
+
+    async with FakeTinder(latency=0.01, error_rate=0.05) as server:
+        client = tinder.Client()
+        await client.login("token")
+        await client.fetch_recs()
+"""
+import asyncio
+import random
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+from tinder import http
+from tinder.gateway import HEARTBEAT
+
+PHOTO_SIZES = ((640, 800), (320, 400), (172, 216), (84, 106))
+ASSET_BODY = bytes(range(256)) * 1024
+
+
+def make_photo(user_index: int, photo_index: int) -> Dict[str, Any]:
+    photo_id = f"{user_index:08x}-0000-4000-8000-{photo_index:012x}"
+    base = f"https://images-ssl.gotinder.com/{user_index:024x}"
+    return {
+        "id": photo_id,
+        "url": f"{base}/original_{photo_id}.jpeg",
+        "fileName": f"{photo_id}.jpg",
+        "extension": "jpg",
+        "processedFiles": [
+            {"url": f"{base}/{w}x{h}_{photo_id}.jpg", "width": w, "height": h}
+            for w, h in PHOTO_SIZES
+        ],
+    }
+
+
+def make_user(index: int, *, photos: int = 6) -> Dict[str, Any]:
+    return {
+        "_id": f"{index:024x}",
+        "name": f"User {index}",
+        "bio": "Coffee, hiking and bad puns. " * 4,
+        "birth_date": "1995-06-15T00:00:00.000Z",
+        "gender": index % 2,
+        "distance_mi": index % 50,
+        "photos": [make_photo(index, i) for i in range(photos)],
+    }
+
+
+def make_match(index: int, *, messages: int = 0) -> Dict[str, Any]:
+    match_id = f"{index:024x}{index + 1:024x}"
+    return {
+        "_id": match_id,
+        "created_date": "2022-01-01T00:00:00.000Z",
+        "last_activity_date": "2022-01-02T00:00:00.000Z",
+        "message_count": messages,
+        "messages": [],
+        "closed": False,
+        "dead": False,
+        "pending": False,
+        "is_super_like": False,
+        "person": make_user(index + 1, photos=2),
+    }
+
+
+class FakeTinder:
+    """An aiohttp application imitating the Tinder API.
+
+    Args:
+        recs (int): users returned by each ``/user/recs`` call.
+        matches (int): total matches, served in pages by ``/v2/matches``.
+        latency (float): seconds every response is delayed by.
+        error_rate (float): probability for a request to fail with ``error_status``.
+        error_status (int): status of the injected failures.
+        seed (int): seed of the error injection, for reproducible runs.
+        heartbeat_ack (bool): whether the fake gateway answers heartbeats.
+
+    Attributes:
+        reject_gateway (int): number of upcoming gateway handshakes to refuse
+            with a 401, as if the token had expired.
+        gateway_tokens (List[str]): tokens used by the accepted handshakes.
+        honor_range (bool): whether ``/assets`` answers ``Range`` requests
+            with a 206, instead of sending the whole body.
+        ranges (List[Optional[str]]): ``Range`` headers received by ``/assets``.
+        asset_etag (str): ETag of the asset, change it to simulate a new version.
+        if_ranges (List[Optional[str]]): ``If-Range`` headers received by ``/assets``.
+    """
+
+    def __init__(
+        self,
+        *,
+        recs: int = 10,
+        matches: int = 60,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        heartbeat_ack: bool = True,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.heartbeat_ack = heartbeat_ack
+        self.requests: Counter = Counter()
+        self.sockets: List[web.WebSocketResponse] = []
+        self.reject_gateway: int = 0
+        self.gateway_tokens: List[str] = []
+        self.honor_range: bool = True
+        self.ranges: List[Optional[str]] = []
+        self.asset_etag: str = '"asset-v1"'
+        self.if_ranges: List[Optional[str]] = []
+        self._generated: int = 0
+        self._random = random.Random(seed)
+        self._recs = {"status": 200, "results": [make_user(i) for i in range(recs)]}
+        self._teasers = {
+            "data": {
+                "results": [
+                    {"type": "user", "user": {"_id": "", "photos": [make_photo(i, 0)]}}
+                    for i in range(10)
+                ]
+            }
+        }
+        self._matches = [make_match(i) for i in range(matches)]
+        self._server: Optional[TestServer] = None
+        self._saved: Dict[str, str] = {}
+
+        self.app = web.Application(middlewares=[self._inject])
+        self.app.router.add_get("/user/recs", self.get_recs)
+        self.app.router.add_get("/v2/fast-match/teasers", self.get_teasers)
+        self.app.router.add_get("/v2/matches", self.get_matches)
+        self.app.router.add_post("/like/{user_id}", self.decide)
+        self.app.router.add_post("/pass/{user_id}", self.decide)
+        self.app.router.add_get("/assets/{name}", self.get_asset)
+        self.app.router.add_get("/ws/generate", self.generate_gateway)
+        self.app.router.add_get("/ws", self.gateway)
+
+    @web.middleware
+    async def _inject(self, request: web.Request, handler):
+        self.requests[request.method, request.match_info.route.resource.canonical] += 1
+        if request.path == "/ws":
+            return await handler(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.json_response({"error": "injected"}, status=self.error_status)
+        return await handler(request)
+
+    async def get_recs(self, request: web.Request) -> web.Response:
+        return web.json_response(self._recs)
+
+    async def get_teasers(self, request: web.Request) -> web.Response:
+        return web.json_response(self._teasers)
+
+    async def get_matches(self, request: web.Request) -> web.Response:
+        count = int(request.query.get("count", 60))
+        start = int(request.query.get("page_token") or 0)
+        data: Dict[str, Any] = {"matches": self._matches[start : start + count]}
+        if start + count < len(self._matches):
+            data["next_page_token"] = str(start + count)
+        return web.json_response({"meta": {"status": 200}, "data": data})
+
+    async def decide(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": 200, "match": False, "likes_remaining": 100})
+
+    async def get_asset(self, request: web.Request) -> web.Response:
+        """Serve :data:`ASSET_BODY`, supporting ``Range: bytes=N-`` and ``If-Range``."""
+        header = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        self.ranges.append(header)
+        self.if_ranges.append(if_range)
+        etag = {"ETag": self.asset_etag}
+        stale = if_range is not None and if_range != self.asset_etag
+        if header is None or not self.honor_range or stale:
+            return web.Response(body=ASSET_BODY, content_type="image/jpeg", headers=etag)
+        start = int(header.removeprefix("bytes=").split("-")[0])
+        if start >= len(ASSET_BODY):
+            return web.Response(status=416, headers={"Content-Range": f"bytes */{len(ASSET_BODY)}"})
+        return web.Response(
+            status=206,
+            body=ASSET_BODY[start:],
+            content_type="image/jpeg",
+            headers={
+                "Content-Range": f"bytes {start}-{len(ASSET_BODY) - 1}/{len(ASSET_BODY)}",
+                **etag,
+            },
+        )
+
+    async def generate_gateway(self, request: web.Request) -> web.Response:
+        self._generated += 1
+        return web.json_response({"token": f"fake-gateway-token-{self._generated}"})
+
+    async def gateway(self, request: web.Request) -> web.StreamResponse:
+        if self.reject_gateway:
+            self.reject_gateway -= 1
+            return web.json_response({"error": "token expired"}, status=401)
+        self.gateway_tokens.append(request.query.get("token", ""))
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        try:
+            async for msg in ws:
+                if msg.type is WSMsgType.BINARY and msg.data == HEARTBEAT and self.heartbeat_ack:
+                    await ws.send_bytes(HEARTBEAT)
+        finally:
+            self.sockets.remove(ws)
+        return ws
+
+    async def push(self, frame: bytes) -> None:
+        """Send a frame to every connected gateway client."""
+        for ws in list(self.sockets):
+            await ws.send_bytes(frame)
+
+    async def disconnect(self, code: int = 1000) -> None:
+        """Close every gateway connection with the given close code."""
+        for ws in list(self.sockets):
+            await ws.close(code=code)
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        return str(self._server.make_url("")).rstrip("/")
+
+    async def start(self) -> None:
+        self._server = TestServer(self.app)
+        await self._server.start_server()
+        self._saved = {"base": http.Route.BASE, "gateway": http.HTTPClient.GATEWAY}
+        http.Route.BASE = self.url
+        http.HTTPClient.GATEWAY = self.url.replace("http", "ws", 1) + "/ws"
+
+    async def close(self) -> None:
+        if self._saved:
+            http.Route.BASE = self._saved["base"]
+            http.HTTPClient.GATEWAY = self._saved["gateway"]
+            self._saved = {}
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeTinder":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,8 @@
+from tinder.backoff import ExponentialBackoff
+
+
+def test_backoff_bound_doubles_up_to_maximum():
+    backoff = ExponentialBackoff(1.0, 5.0, rand=lambda low, high: high)
+    assert [backoff.delay() for _ in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+    backoff.reset()
+    assert backoff.delay() == 1.0
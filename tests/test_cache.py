@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+from tinder.cache import AssetCache, _write_atomic
+from tinder.models import Asset
+
+
+class FakeHTTP:
+    def __init__(self):
+        self.requests = []
+
+    async def get_asset_conditional(self, url, *, etag=None, last_modified=None):
+        self.requests.append(etag)
+        if etag == '"v1"':
+            return 304, b"", {}
+        return 200, url.encode() * 10, {"ETag": '"v1"'}
+
+
+def test_asset_cache_hits_revalidates_and_evicts(tmp_path):
+    async def main():
+        http = FakeHTTP()
+        cache = AssetCache(tmp_path, max_bytes=250)
+        first = Asset(None, url="https://cdn/a.jpg", id="a")
+        data = await cache.read(first, http)
+        assert await cache.read(first, http) == data
+        assert http.requests == [None]
+
+        body = cache._path(AssetCache.key_for(first))
+        inode = os.stat(body).st_ino
+        cache.max_age = 0
+        assert await cache.read(first, http) == data
+        assert http.requests == [None, '"v1"']
+        # Revalidation only rewrites the metadata.
+        assert os.stat(body).st_ino == inode
+
+        await cache.read(Asset(None, url="https://cdn/b.jpg", id="b"), http)
+        assert cache.stats()["size"] == 1
+        reloaded = AssetCache(tmp_path)
+        await reloaded._ensure_loaded()
+        assert reloaded.stats()["size"] == 1
+
+    asyncio.run(main())
+
+
+def test_concurrent_reads_share_one_fetch(tmp_path):
+    async def main():
+        http = FakeHTTP()
+        cache = AssetCache(tmp_path)
+        asset = Asset(None, url="https://cdn/a.jpg", id="a")
+        results = await asyncio.gather(*(cache.read(asset, http) for _ in range(8)))
+        return http.requests, results
+
+    requests, results = asyncio.run(main())
+    assert requests == [None]
+    assert len(set(results)) == 1
+
+
+def test_concurrent_writes_of_one_key(tmp_path):
+    async def main():
+        path = str(tmp_path / "entry")
+        await asyncio.gather(
+            *(asyncio.to_thread(_write_atomic, path, bytes([i]) * 1000) for i in range(8))
+        )
+        return path
+
+    path = asyncio.run(main())
+    with open(path, "rb") as f:
+        assert len(f.read()) == 1000
+    assert [p.name for p in tmp_path.iterdir()] == ["entry"]
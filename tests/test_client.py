@@ -0,0 +1,157 @@
+import asyncio
+
+import tinder
+from tinder.errors import ClientException
+
+
+class FakeUser:
+    def __init__(self, id):
+        self.id = id
+
+    async def like(self):
+        await asyncio.sleep(0.01 * (5 - self.id))
+        if self.id == 2:
+            raise RuntimeError("failed")
+        return self.id
+
+
+def test_like_many_yields_every_result():
+    async def main():
+        client = tinder.Client(loop=asyncio.get_running_loop())
+        users = [FakeUser(i) for i in range(5)]
+        results = [item async for item in client.like_many(users, concurrency=2)]
+        await client.close()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 5
+    by_id = {user.id: result for user, result in results}
+    assert isinstance(by_id.pop(2), RuntimeError)
+    assert by_id == {0: 0, 1: 1, 3: 3, 4: 4}
+
+
+def test_client_against_fake_server():
+    from tests.fakeserver import FakeTinder
+
+    async def main():
+        async with FakeTinder(matches=130, error_rate=0.2, seed=1) as server:
+            client = tinder.Client(loop=asyncio.get_running_loop())
+            await client.login("token")
+            users = await client.fetch_recs()
+            matches = [match async for match in client.matches()]
+            await client.ws.connect()
+            await server.push(tinder.gateway.HEARTBEAT)
+            await client.ws.ws.receive()
+            await client.close()
+            return users, matches, server.requests
+
+    users, matches, requests = asyncio.run(main())
+    assert len(users) == 10
+    assert len({match.id for match in matches}) == 130
+    assert requests["GET", "/ws"] == 1
+
+
+def test_wait_for_listeners_are_swept():
+    async def main():
+        client = tinder.Client(loop=asyncio.get_running_loop())
+        odd = client.wait_for("number", check=lambda n: n % 2)
+        expired = client.wait_for("number", timeout=0)
+        try:
+            await expired
+        except asyncio.TimeoutError:
+            pass
+        waiting = asyncio.ensure_future(odd)
+        await asyncio.sleep(0)
+        client.dispatch("number", 2)
+        remaining = len(client._listeners["number"])
+        client.dispatch("number", 3)
+        result = await waiting
+        await client.close()
+        return remaining, result, client._listeners
+
+    remaining, result, listeners = asyncio.run(main())
+    assert remaining == 1
+    assert result == 3
+    assert listeners == {}
+
+
+def test_bounded_dispatch_runs_every_handler():
+    async def main():
+        client = tinder.Client(loop=asyncio.get_running_loop(), dispatch_workers=2)
+        seen = []
+        running = 0
+        peak = 0
+
+        @client.event
+        async def on_number(n):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            seen.append(n)
+            running -= 1
+
+        for n in range(20):
+            client.dispatch("number", n)
+        await client._dispatcher.join()
+        stats = client.dispatch_stats()
+        await client.close()
+        return seen, peak, stats
+
+    seen, peak, stats = asyncio.run(main())
+    assert sorted(seen) == list(range(20))
+    assert peak == 2
+    assert stats.processed == 20 and stats.high_water == 20 and stats.queued == 0
+
+
+def test_close_drains_decisions_in_flight():
+    from tests.fakeserver import FakeTinder
+
+    async def main():
+        async with FakeTinder(latency=0.2) as server:
+            client = tinder.Client(loop=asyncio.get_running_loop())
+            await client.login("token")
+            users = await client.fetch_recs()
+
+            async def like_all():
+                return [result async for result in client.like_many(users, concurrency=10)]
+
+            caller = asyncio.ensure_future(like_all())
+            await asyncio.sleep(0.05)
+            caller.cancel()
+            await client.close(timeout=1.0)
+            try:
+                await users[0].like()
+            except tinder.errors.ClientException:
+                refused = True
+            return server.requests["POST", "/like/{user_id}"], refused, len(client._tasks)
+
+    likes, refused, tasks = asyncio.run(main())
+    assert likes == 10
+    assert refused
+    assert tasks == 0
+
+
+def test_like_many_finishes_when_close_cancels_decisions():
+    from tests.fakeserver import FakeTinder
+
+    async def main():
+        async with FakeTinder() as server:
+            client = tinder.Client(loop=asyncio.get_running_loop())
+            await client.login("token")
+            users = await client.fetch_recs()
+            server.latency = 1.0
+
+            async def like_all():
+                return [result async for result in client.like_many(users, concurrency=4)]
+
+            consumer = asyncio.ensure_future(like_all())
+            await asyncio.sleep(0.1)
+            await client.close(timeout=0.1)
+            return users, await asyncio.wait_for(consumer, 2.0)
+
+    users, results = asyncio.run(main())
+    assert len(results) == len(users)
+    assert all(
+        isinstance(result, (asyncio.CancelledError, ClientException)) for _, result in results
+    )
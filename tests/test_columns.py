@@ -0,0 +1,45 @@
+from tinder.columns import UserColumns
+from tinder.models import Asset, User
+from tinder.state import ConnectionState
+
+USER_DATA = {
+    "_id": "5f0c1b2a3d4e5f6a7b8c9d0e",
+    "name": "Alice",
+    "distance_mi": 3,
+    "photos": [
+        {"id": "11111111-2222-3333-4444-555555555555", "url": "", "processedFiles": []},
+        {"id": "not-a-uuid.jpg", "url": "", "processedFiles": []},
+    ],
+}
+
+
+def test_columns_round_trip_and_update():
+    columns = UserColumns()
+    view = columns.add(USER_DATA)
+    columns.add({"_id": "legacy-id", "name": "Alice"})
+    assert len(columns) == 2
+    assert columns._strings == ["Alice"]
+    assert view.id == "5f0c1b2a3d4e5f6a7b8c9d0e"
+    assert view.photo_ids == ("11111111-2222-3333-4444-555555555555", "not-a-uuid.jpg")
+    assert columns.get("legacy-id").distance_mi is None
+    upper = columns.add(dict(USER_DATA, _id=USER_DATA["_id"].upper()))
+    assert upper.id == USER_DATA["_id"].upper()
+    assert len(columns) == 3
+
+    columns.add(dict(USER_DATA, distance_mi=7, photos=USER_DATA["photos"][:1]))
+    assert len(columns) == 3
+    assert view.distance_mi == 7
+    assert view.photo_ids == ("11111111-2222-3333-4444-555555555555",)
+
+
+def test_state_records_stored_users():
+    columns = UserColumns()
+    state = ConnectionState(
+        dispatch=None, handlers={}, http=None, loop=None, max_users=1, user_columns=columns
+    )
+    state.store_user(User(state, data=USER_DATA))
+    state.store_user(User(state, data=dict(USER_DATA, _id="0" * 24)))
+    assert len(columns) == 2
+    assert "5f0c1b2a3d4e5f6a7b8c9d0e" in columns
+    state.store_teasers([Asset(state, url="", id="not-a-uuid.jpg")])
+    assert columns.get("5f0c1b2a3d4e5f6a7b8c9d0e").matches_teaser()
@@ -0,0 +1,88 @@
+import asyncio
+
+import tinder
+from tests.fakeserver import FakeTinder
+from tinder import client as client_module
+from tinder.gateway import GatewayMessage, HEARTBEAT
+
+
+def test_heartbeat_frame():
+    assert GatewayMessage(HEARTBEAT).is_heartbeat
+
+
+def test_nested_message_is_decoded_without_copy():
+    # field 1: varint 150, field 2: message { field 1: "hi" }
+    data = bytes([0x08, 0x96, 0x01, 0x12, 0x04, 0x0A, 0x02]) + b"hi"
+    message = GatewayMessage(data)
+    assert message.get(1) == 150
+    assert not message.is_heartbeat
+    nested = message.message(2)
+    assert bytes(nested.get(1)) == b"hi"
+    assert nested.get(1).obj is data
+
+
+def run_gateway(scenario, **server_options):
+    async def main():
+        async with FakeTinder(**server_options) as server:
+            client = tinder.Client(loop=asyncio.get_running_loop(), heartbeat_timeout=0.1)
+            client.ws.heartbeat_interval = 0.05
+            await client.login("token")
+            connects = []
+
+            @client.event
+            async def on_connect():
+                connects.append(client.loop.time())
+
+            client._gateway_task = client._tasks.spawn(client.connect())
+            try:
+                await asyncio.wait_for(scenario(client, server, connects), 5)
+            finally:
+                await client.close()
+            return server
+
+    return asyncio.run(main())
+
+
+async def wait_until(predicate):
+    while not predicate():
+        await asyncio.sleep(0.01)
+
+
+def test_silent_gateway_is_reconnected_with_the_same_token(monkeypatch):
+    delays = []
+
+    def delay(self):
+        delays.append(0)
+        return 0
+
+    monkeypatch.setattr(client_module.ExponentialBackoff, "delay", delay)
+
+    async def scenario(client, server, connects):
+        await wait_until(lambda: len(connects) >= 3)
+
+    server = run_gateway(scenario, heartbeat_ack=False)
+    assert len(delays) >= 2
+    assert server.requests["GET", "/ws/generate"] == 1
+    assert len(set(server.gateway_tokens)) == 1
+
+
+def test_rejected_gateway_token_is_refreshed(monkeypatch):
+    monkeypatch.setattr(client_module.ExponentialBackoff, "delay", lambda self: 0)
+
+    async def scenario(client, server, connects):
+        await wait_until(lambda: len(connects) == 1)
+        # A rejection close code asks for a new token.
+        await server.disconnect(4003)
+        await wait_until(lambda: len(connects) == 2)
+        # So does a handshake refused with a 401.
+        server.reject_gateway = 1
+        await server.disconnect(1001)
+        await wait_until(lambda: len(connects) == 3)
+
+    server = run_gateway(scenario)
+    assert server.gateway_tokens == [
+        "fake-gateway-token-1",
+        "fake-gateway-token-2",
+        "fake-gateway-token-3",
+    ]
+    assert server.requests["GET", "/ws"] == 4
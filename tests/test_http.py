@@ -1,3 +1,5 @@
+import asyncio
+
 from tinder import http
 
 
@@ -17,3 +19,144 @@ def test_route_format():
     r = http.Route("GET", "/test/{test}", test="working")
     assert r.method == "GET"
     assert r.url == "https://api.gotinder.com/test/working"
+
+
+def test_route_bucket_uses_path_template():
+    r1 = http.Route("POST", "/like/{user_id}", user_id="1")
+    r2 = http.Route("POST", "/like/{user_id}", user_id="2")
+    assert r1.bucket == r2.bucket == "POST /like/{user_id}"
+
+
+def test_ratelimit_queues_when_exhausted():
+    async def main():
+        loop = asyncio.get_running_loop()
+        ratelimit = http.RateLimit("GET /test", loop=loop)
+        async with ratelimit.acquire():
+            pass
+        ratelimit.block(0.05)
+        assert ratelimit.is_exhausted()
+        start = loop.time()
+        async with ratelimit.acquire():
+            elapsed = loop.time() - start
+        return elapsed
+
+    assert asyncio.run(main()) >= 0.04
+
+
+def test_pool_survives_session_recreate():
+    async def main():
+        client = http.HTTPClient(loop=asyncio.get_running_loop(), max_connections=10)
+        assert client.pool_stats() == (0, 0, 0, 10, 0)
+        await client.login("token")
+        connector = client.connector
+        await client._HTTPClient__session.close()
+        await client.recreate()
+        assert client.connector is connector and not connector.closed
+        await client.close()
+        assert connector.closed
+
+    asyncio.run(main())
+
+
+def test_route_static_url_is_shared():
+    r1 = http.Route("GET", "/profile")
+    r2 = http.Route("GET", "/profile")
+    assert r1.yarl_url is r2.yarl_url
+    assert str(r1.yarl_url) == "https://api.gotinder.com/profile"
+
+
+def test_route_format_quotes_params():
+    r = http.Route("GET", "/user/{user_id}", user_id="a b")
+    assert r.url == "https://api.gotinder.com/user/a%20b"
+    assert str(r.yarl_url) == r.url
+
+
+def test_identical_gets_share_one_request():
+    calls = []
+
+    async def main():
+        client = http.HTTPClient(loop=asyncio.get_running_loop(), response_cache_ttl=60)
+
+        async def fake_request(route, **kwargs):
+            calls.append(route.url)
+            await asyncio.sleep(0.01)
+            return {"url": route.url}
+
+        client._request = fake_request
+        results = await asyncio.gather(*(client.get_user_profile("1") for _ in range(5)))
+        await client.get_user_profile("1")
+        await client.like("1")
+        return results
+
+    results = asyncio.run(main())
+    assert all(result is results[0] for result in results)
+    assert calls == ["https://api.gotinder.com/user/1", "https://api.gotinder.com/like/1"]
+
+
+def test_fresh_data_is_not_coalesced():
+    calls = []
+
+    async def main():
+        client = http.HTTPClient(loop=asyncio.get_running_loop(), response_cache_ttl=60)
+
+        async def fake_request(route, **kwargs):
+            calls.append(route.url)
+            await asyncio.sleep(0.01)
+            return {"url": route.url}
+
+        client._request = fake_request
+        await asyncio.gather(client.get_recs2(), client.get_recs2())
+        await client.get_messages("m1")
+        await client.get_messages("m1")
+        await client.get_user_profile("1")
+        await client.get_user_profile("1", cached=False)
+
+    asyncio.run(main())
+    assert [url.split("?")[0] for url in calls] == [
+        "https://api.gotinder.com/v2/recs/core",
+        "https://api.gotinder.com/v2/recs/core",
+        "https://api.gotinder.com/v2/matches/m1/messages",
+        "https://api.gotinder.com/v2/matches/m1/messages",
+        "https://api.gotinder.com/user/1",
+        "https://api.gotinder.com/user/1",
+    ]
+
+
+def test_empty_json_body_raises_http_exception():
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from tinder.errors import HTTPException
+    from tinder.retry import RetryPolicy
+
+    async def empty(request):
+        return web.Response(
+            status=int(request.match_info["status"]), content_type="application/json"
+        )
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/status/{status}", empty)
+        server = TestServer(app)
+        await server.start_server()
+        client = http.HTTPClient(
+            loop=asyncio.get_running_loop(), retry_policy=RetryPolicy(max_attempts=1)
+        )
+        original_base = http.Route.BASE
+        http.Route.BASE = str(server.make_url("")).rstrip("/")
+        try:
+            await client.login("token")
+            ok = await client.request(http.Route("POST", "/status/204"))
+            try:
+                await client.request(http.Route("POST", "/status/500"))
+            except HTTPException as exc:
+                error = exc
+        finally:
+            http.Route.BASE = original_base
+            await client.close()
+            await server.close()
+        return ok, error
+
+    ok, error = asyncio.run(main())
+    assert ok is None
+    assert error.status == 500
@@ -0,0 +1,104 @@
+import asyncio
+
+from tinder.iterators import MatchIterator, RecsIterator
+from tinder.state import ConnectionState
+
+
+class FakeUser:
+    def __init__(self, id):
+        self.id = id
+
+
+def test_recs_iterator_prefetches_and_dedupes():
+    pages = [[FakeUser("a"), FakeUser("b")], [], [FakeUser("b"), FakeUser("c")]]
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        return pages[len(calls) - 1] if len(calls) <= len(pages) else [FakeUser("z")]
+
+    async def main():
+        recs = RecsIterator(fetch, loop=asyncio.get_running_loop(), limit=3, delay=0)
+        first = await recs.__anext__()
+        await asyncio.sleep(0)
+        prefetched = len(calls)
+        rest = await recs.flatten()
+        return first, prefetched, rest
+
+    first, prefetched, rest = asyncio.run(main())
+    assert first.id == "a"
+    assert prefetched == 2
+    assert [user.id for user in rest] == ["b", "c"]
+
+
+def test_match_iterator_follows_page_tokens():
+    class FakeHTTP:
+        def __init__(self):
+            self.tokens = []
+
+        async def matches(self, count, message, page_token):
+            self.tokens.append(page_token)
+            if page_token is None:
+                return {"data": {"matches": [{"_id": "m1"}], "next_page_token": "p2"}}
+            return {"data": {"matches": [{"_id": "m2"}]}}
+
+    async def main():
+        http = FakeHTTP()
+        state = ConnectionState(dispatch=None, handlers={}, http=http, loop=None)
+        matches = await MatchIterator(state, loop=asyncio.get_running_loop()).flatten()
+        return http.tokens, matches, state
+
+    tokens, matches, state = asyncio.run(main())
+    assert tokens == [None, "p2"]
+    assert [match.id for match in matches] == ["m1", "m2"]
+    assert state.get_match("m2") is matches[1]
+
+
+def test_recs_iterator_waits_when_pages_repeat(monkeypatch):
+    calls = []
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    async def fetch():
+        calls.append(None)
+        return [FakeUser("a"), FakeUser("b")] if len(calls) < 4 else [FakeUser("c")]
+
+    async def main():
+        recs = RecsIterator(fetch, loop=asyncio.get_running_loop(), limit=3, delay=60)
+        return [user.id async for user in recs]
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    assert asyncio.run(main()) == ["a", "b", "c"]
+    assert len(calls) == 4
+    assert sleeps == [60, 60]
+
+
+def test_breaking_out_cancels_prefetch():
+    cancelled = []
+
+    async def fetch():
+        if fetch.calls:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        fetch.calls += 1
+        return [FakeUser(str(fetch.calls)), FakeUser("x" + str(fetch.calls))]
+
+    fetch.calls = 0
+
+    async def main():
+        async for user in RecsIterator(fetch, loop=asyncio.get_running_loop()):
+            break
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return user, list(cancelled)
+
+    user, cancelled_before_shutdown = asyncio.run(main())
+    assert user.id == "1"
+    assert cancelled_before_shutdown == [True]
@@ -0,0 +1,89 @@
+import asyncio
+
+from tinder.journal import DecisionJournal
+from tinder.models import User
+from tinder.state import ConnectionState
+
+
+def test_journal_replays_and_compacts(tmp_path):
+    path = tmp_path / "decisions.log"
+    journal = DecisionJournal(path)
+    journal.record("u1", "like")
+    journal.record("u1", "like")
+    journal.record("u2", "skip")
+    journal.record("u2", "like")
+    journal.close()
+    with open(path, "a") as f:
+        f.write("skip\tu3")  # truncated by a crash
+
+    journal = DecisionJournal(path)
+    assert dict(journal) == {"u1": "like", "u2": "like"}
+    journal.record("u1", "skip")
+    journal.compact()
+    journal.record("u4", "like")
+    journal.close()
+    assert path.read_text() == "skip\tu1\nlike\tu2\nlike\tu4\n"
+
+
+def test_record_after_truncated_line(tmp_path):
+    path = tmp_path / "decisions.log"
+    path.write_text("like\taaa\nlike\tcc")
+    journal = DecisionJournal(path)
+    journal.record("ddd", "like")
+    journal.close()
+    assert path.read_text() == "like\taaa\nlike\tddd\n"
+    with DecisionJournal(path) as journal:
+        assert dict(journal) == {"aaa": "like", "ddd": "like"}
+
+
+def test_duplicate_decisions_are_not_sent(tmp_path):
+    calls = []
+
+    class FakeHTTP:
+        async def like(self, user_id):
+            calls.append(user_id)
+            await asyncio.sleep(0)
+            return {"likes_remaining": 100}
+
+    async def main():
+        journal = DecisionJournal(tmp_path / "decisions.log")
+        state = ConnectionState(
+            dispatch=None, handlers={}, http=FakeHTTP(), loop=None, decision_journal=journal
+        )
+        user = User(state, data={"_id": "u1", "name": "Alice"})
+        results = await asyncio.gather(user.like(), user.like())
+        results.append(await user.like())
+        journal.close()
+        return results
+
+    assert asyncio.run(main()) == [{"likes_remaining": 100}, None, None]
+    assert calls == ["u1"]
+    with DecisionJournal(tmp_path / "decisions.log") as journal:
+        assert journal.get("u1") == "like"
+
+
+def test_skipped_user_can_be_liked(tmp_path):
+    calls = []
+
+    class FakeHTTP:
+        async def like(self, user_id):
+            calls.append(("like", user_id))
+            return {"likes_remaining": 100}
+
+        async def skip(self, user_id):
+            calls.append(("skip", user_id))
+            return {"status": 200}
+
+    async def main():
+        with DecisionJournal(tmp_path / "decisions.log") as journal:
+            state = ConnectionState(
+                dispatch=None, handlers={}, http=FakeHTTP(), loop=None, decision_journal=journal
+            )
+            user = User(state, data={"_id": "u1", "name": "Alice"})
+            await user.skip()
+            await user.skip()
+            await user.like()
+            return journal.get("u1")
+
+    assert asyncio.run(main()) == "like"
+    assert calls == [("skip", "u1"), ("like", "u1")]
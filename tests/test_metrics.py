@@ -0,0 +1,59 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from tinder import http
+from tinder.errors import NotFound
+from tinder.metrics import InMemoryMetrics, RequestTrace
+
+
+def test_histogram_quantiles():
+    metrics = InMemoryMetrics()
+    for latency in (0.001, 0.02, 0.02, 3.0):
+        trace = RequestTrace("GET /user/{user_id}", "GET")
+        trace.latency = latency
+        trace.status = 200
+        metrics.on_request(trace)
+    assert metrics.quantile("GET /user/{user_id}", 0.5) == 0.025
+    assert metrics.quantile("GET /user/{user_id}", 0.99) == 5.0
+    assert metrics.statuses["GET /user/{user_id}", 200] == 4
+
+
+def test_client_reports_requests_to_metrics():
+    async def like(request):
+        await request.read()
+        return web.json_response({"likes_remaining": 99})
+
+    async def missing(request):
+        return web.json_response({"error": "gone"}, status=404)
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/like/{user_id}", like)
+        app.router.add_get("/user/{user_id}", missing)
+        server = TestServer(app)
+        await server.start_server()
+        metrics = InMemoryMetrics()
+        client = http.HTTPClient(loop=asyncio.get_running_loop(), metrics=metrics)
+        original_base = http.Route.BASE
+        http.Route.BASE = str(server.make_url(""))
+        try:
+            await client.login("token")
+            await client.request(http.Route("POST", "/like/{user_id}", user_id="1"), json={"a": 1})
+            try:
+                await client.get_user_profile("2")
+            except NotFound:
+                pass
+        finally:
+            http.Route.BASE = original_base
+            await client.close()
+            await server.close()
+        return metrics.snapshot()
+
+    snapshot = asyncio.run(main())
+    like_stats = snapshot["POST /like/{user_id}"]
+    assert like_stats["statuses"] == {200: 1}
+    assert like_stats["bytes_sent"] == len(b'{"a": 1}')
+    assert like_stats["bytes_received"] > 0
+    assert snapshot["GET /user/{user_id}"]["errors"] == {"NotFound": 1}
@@ -0,0 +1,128 @@
+import asyncio
+
+import tinder
+from tests.fakeserver import ASSET_BODY, FakeTinder
+from tinder.models import Asset, User
+from tinder.state import ConnectionState
+
+USER_DATA = {
+    "_id": "5f0c1b2a3d4e5f6a7b8c9d0e",
+    "name": "Alice",
+    "distance_mi": 3,
+    "photos": [
+        {
+            "id": "11111111-2222-3333-4444-555555555555",
+            "url": "https://images-ssl.gotinder.com/u/original.jpg",
+            "processedFiles": [
+                {"url": "https://images-ssl.gotinder.com/u/640.jpg", "width": 640, "height": 800},
+                {"url": "https://images-ssl.gotinder.com/u/320.jpg", "width": 320, "height": 400},
+            ],
+        }
+    ],
+}
+
+
+def test_user_photos_are_lazy():
+    user = User(None, data=USER_DATA)
+    assert user._photos is None
+    photos = user.photos
+    assert photos is user.photos
+    assert photos[0].id == "11111111-2222-3333-4444-555555555555"
+    assert photos[0]._processed is None
+
+
+def test_asset_processed_renditions():
+    asset = User(None, data=USER_DATA).photos[0]
+    assert list(asset.processed) == ["640x800", "320x400"]
+    rendition = asset.processed["320x400"]
+    assert rendition.url == "https://images-ssl.gotinder.com/u/320.jpg"
+    assert rendition.id == asset.id
+    assert rendition.size == "320x400"
+
+
+def test_asset_rendition_picks_smallest_covering_size():
+    asset = User(None, data=USER_DATA).photos[0]
+    assert asset.rendition("300x300").size == "320x400"
+    assert asset.rendition("500x500").size == "640x800"
+    assert asset.rendition("1000x1000") is asset
+    assert asset.rendition("300x300").filename == f"{asset.id}_320x400.jpg"
+
+
+def test_user_matches_teaser():
+    state = ConnectionState(dispatch=None, handlers={}, http=None, loop=None)
+    user = User(state, data=USER_DATA)
+    assert user.photo_ids == {"11111111-2222-3333-4444-555555555555"}
+    assert not user.matches_teaser()
+    teaser = Asset(state, url="https://cdn/t.jpg", id="11111111-2222-3333-4444-555555555555")
+    state.store_teasers([teaser])
+    assert user.matches_teaser()
+
+
+def test_asset_save_streams_and_resumes(tmp_path):
+    path = tmp_path / "photo.jpg"
+    part = tmp_path / "photo.jpg.part"
+    validator = tmp_path / "photo.jpg.part.validator"
+
+    async def main():
+        async with FakeTinder() as server:
+            client = tinder.Client(loop=asyncio.get_running_loop())
+            await client.login("token")
+            asset = Asset(client._connection, url=server.url + "/assets/photo.jpg")
+            results = []
+
+            # A fresh download goes through the .part file.
+            results.append(await asset.save(path, chunk_size=4096))
+            assert path.read_bytes() == ASSET_BODY and not part.exists()
+            assert not validator.exists()
+
+            # Resuming asks for the missing bytes only.
+            part.write_bytes(ASSET_BODY[:1000])
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY
+
+            # A server ignoring the range sends everything again, overwriting the part.
+            server.honor_range = False
+            part.write_bytes(b"x" * 1000)
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY
+
+            # Nothing left to fetch: the complete part file is kept.
+            server.honor_range = True
+            part.write_bytes(ASSET_BODY)
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY and not part.exists()
+
+            # A part longer than the asset is discarded and downloaded again.
+            part.write_bytes(ASSET_BODY + b"x")
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY
+
+            # The stored ETag is sent with the range; a changed asset comes back whole.
+            part.write_bytes(b"x" * 1000)
+            validator.write_text('"asset-v0"')
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY and not validator.exists()
+
+            # An unchanged asset still resumes.
+            part.write_bytes(ASSET_BODY[:1000])
+            validator.write_text('"asset-v1"')
+            results.append(await asset.save(path, resume=True))
+            assert path.read_bytes() == ASSET_BODY
+
+            await client.close()
+            return results, server.ranges, server.if_ranges
+
+    size = len(ASSET_BODY)
+    results, ranges, if_ranges = asyncio.run(main())
+    assert results == [size] * 7
+    assert ranges == [
+        None,
+        "bytes=1000-",
+        "bytes=1000-",
+        f"bytes={size}-",
+        f"bytes={size + 1}-",
+        None,
+        "bytes=1000-",
+        "bytes=1000-",
+    ]
+    assert if_ranges == [None] * 6 + ['"asset-v0"', '"asset-v1"']
@@ -0,0 +1,103 @@
+import asyncio
+
+from tinder import outbox
+from tinder.errors import HTTPException
+from tinder.state import ConnectionState
+
+
+class FakeResponse:
+    status = 502
+
+
+PROFILE = {
+    "_id": "me",
+    "name": "Bob",
+    "birth_date": "1990-01-01T00:00:00.000Z",
+    "create_date": "2020-01-01T00:00:00.000Z",
+    "distance_filter": 10,
+    "gender": 0,
+    "gender_filter": 1,
+}
+
+
+class FakeHTTP:
+    def __init__(self, author="me", history=(), lost=False):
+        self.sent = []
+        self.author = author
+        # Whether the failed send never reached the server.
+        self.lost = lost
+        self.messages = [dict(message, timestamp=i) for i, message in enumerate(history)]
+
+    async def send_message(self, match_id, content):
+        self.sent.append(content)
+        message = {
+            "_id": str(len(self.sent)),
+            "match_id": match_id,
+            "message": content,
+            "from": self.author,
+            "timestamp": len(self.messages),
+        }
+        failed = content == "flaky" and self.sent.count("flaky") == 1
+        if not (failed and self.lost):
+            self.messages.append(message)
+        if failed:
+            raise HTTPException(FakeResponse(), "bad gateway")
+        return message
+
+    async def get_messages(self, match_id, count=100, page_token=None):
+        return {"data": {"messages": self.messages[::-1][:count]}}
+
+
+def run_outbox(http, profile):
+    async def main():
+        state = ConnectionState(dispatch=None, handlers={}, http=http, loop=None)
+        if profile is not None:
+            state.store_client_user(profile)
+        futures = [state.outbox.send("m1", content) for content in ("a", "flaky", "b")]
+        messages = await asyncio.gather(*futures)
+        return messages, state
+
+    return asyncio.run(main())
+
+
+def test_outbox_keeps_order_and_does_not_resend_delivered(monkeypatch):
+    monkeypatch.setattr(outbox.ExponentialBackoff, "delay", lambda self: 0)
+    http = FakeHTTP()
+    messages, state = run_outbox(http, PROFILE)
+    assert http.sent == ["a", "flaky", "b"]
+    assert [m.content for m in messages] == ["a", "flaky", "b"]
+    assert state.outbox.pending() == 0
+
+
+def test_outbox_does_not_take_other_messages_for_ours(monkeypatch):
+    monkeypatch.setattr(outbox.ExponentialBackoff, "delay", lambda self: 0)
+    # The same text from the match is not our delivery.
+    http = FakeHTTP(author="them")
+    run_outbox(http, PROFILE)
+    assert http.sent == ["a", "flaky", "flaky", "b"]
+    # Nor is anything while our own id is unknown.
+    http = FakeHTTP()
+    run_outbox(http, None)
+    assert http.sent == ["a", "flaky", "flaky", "b"]
+
+
+def test_outbox_only_takes_new_messages_for_ours(monkeypatch):
+    monkeypatch.setattr(outbox.ExponentialBackoff, "delay", lambda self: 0)
+    # An older "flaky" of ours in the history is not the lost delivery.
+    http = FakeHTTP(history=[{"_id": "old", "message": "flaky", "from": "me"}], lost=True)
+    run_outbox(http, PROFILE)
+    assert http.sent == ["a", "flaky", "flaky", "b"]
+
+
+def test_outbox_ignores_messages_without_timestamp(monkeypatch):
+    monkeypatch.setattr(outbox.ExponentialBackoff, "delay", lambda self: 0)
+    http = FakeHTTP()
+    get_messages = http.get_messages
+
+    async def untimed(match_id, **kwargs):
+        data = await get_messages(match_id, **kwargs)
+        return {"data": {"messages": [dict(m, timestamp=None) for m in data["data"]["messages"]]}}
+
+    http.get_messages = untimed
+    run_outbox(http, PROFILE)
+    assert http.sent == ["a", "flaky", "flaky", "b"]
@@ -0,0 +1,28 @@
+import asyncio
+
+import aiohttp
+
+from tinder.retry import RetryPolicy
+
+
+def test_decorrelated_jitter_stays_within_bounds():
+    policy = RetryPolicy(base=1.0, cap=10.0, rand=lambda low, high: high)
+    delays = policy.delays()
+    assert [next(delays) for _ in range(4)] == [3.0, 9.0, 10.0, 10.0]
+
+
+def test_non_idempotent_requests_are_retried_conservatively():
+    policy = RetryPolicy()
+    assert policy.should_retry_status("GET", 502)
+    assert not policy.should_retry_status("POST", 502)
+    assert policy.should_retry_status("POST", 503)
+    assert policy.should_retry_error("GET", aiohttp.ServerDisconnectedError())
+    assert not policy.should_retry_error("POST", aiohttp.ServerDisconnectedError())
+    assert RetryPolicy(retry_non_idempotent=True).should_retry_status("POST", 502)
+
+
+def test_timeouts_are_retried_for_idempotent_requests():
+    policy = RetryPolicy()
+    # On Python 3.10 asyncio.TimeoutError is neither TimeoutError nor OSError.
+    assert policy.should_retry_error("GET", asyncio.TimeoutError())
+    assert not policy.should_retry_error("POST", asyncio.TimeoutError())
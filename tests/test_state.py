@@ -0,0 +1,51 @@
+from tinder.state import ConnectionState
+
+
+def make_state():
+    events = []
+    state = ConnectionState(
+        dispatch=lambda event, *args: events.append((event, *args)),
+        handlers={},
+        http=None,
+        loop=None,
+    )
+    return state, events
+
+
+def test_parse_updates_applies_delta_and_cursor():
+    state, events = make_state()
+    changed = state.parse_updates(
+        {
+            "matches": [
+                {
+                    "_id": "m1",
+                    "messages": [{"_id": "msg1", "match_id": "m1", "from": "u1", "message": "hi"}],
+                }
+            ],
+            "blocks": [],
+            "last_activity_date": "2022-06-23T00:00:00.000Z",
+        }
+    )
+    assert changed
+    assert state.last_activity_date == "2022-06-23T00:00:00.000Z"
+    assert [event[0] for event in events] == ["match", "message"]
+    assert [m.content for m in state.get_messages("m1")] == ["hi"]
+
+    events.clear()
+    assert not state.parse_updates({"matches": [], "blocks": []})
+    assert state.last_activity_date == "2022-06-23T00:00:00.000Z"
+
+    state.parse_updates({"blocks": ["m1"]})
+    assert events == [("block", "m1")]
+    assert "m1" not in state._matches
+
+
+def test_only_explicit_clear_collects_garbage(monkeypatch):
+    from tinder import state as state_module
+
+    collections = []
+    monkeypatch.setattr(state_module.gc, "collect", lambda: collections.append(1))
+    state, _ = make_state()
+    assert collections == []
+    state.clear()
+    assert collections == [1]
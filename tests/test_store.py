@@ -0,0 +1,120 @@
+import asyncio
+
+from tinder.models import User
+from tinder.state import ConnectionState
+from tinder.store import SQLiteStateStore
+
+USER_DATA = {"_id": "u1", "name": "Alice", "distance_mi": 3}
+PROFILE = {
+    "_id": "me",
+    "name": "Bob",
+    "birth_date": "1990-01-01T00:00:00.000Z",
+    "create_date": "2020-01-01T00:00:00.000Z",
+    "distance_filter": 10,
+    "gender": 0,
+    "gender_filter": 1,
+}
+
+
+def make_state(store, events=None):
+    def dispatch(event, *args):
+        if events is not None:
+            events.append(event)
+
+    return ConnectionState(dispatch=dispatch, handlers={}, http=None, loop=None, state_store=store)
+
+
+def test_state_survives_restart(tmp_path):
+    async def first_run():
+        store = SQLiteStateStore(tmp_path / "state.db")
+        state = make_state(store)
+        state.store_user(User(state, data=USER_DATA))
+        state.store_client_user(PROFILE)
+        state.record_decision("u1", "like")
+        state.parse_updates(
+            {
+                "matches": [{"_id": "m1", "person": {"_id": "u2", "name": "Carol"}}, {"_id": "m2"}],
+                "last_activity_date": "2022-06-23T00:00:00.000Z",
+            }
+        )
+        await state.checkpoint()
+        state.parse_updates({"matches": [{"_id": "m2", "closed": True}]})
+        await state.checkpoint()
+        await store.close()
+
+    async def second_run():
+        store = SQLiteStateStore(tmp_path / "state.db")
+        state = make_state(store)
+        assert state._users.peek("u1") is None
+        result = (
+            state.last_activity_date,
+            state.get_user("u1").name,
+            state.get_match("m1").person.name,
+            state.get_match("m2"),
+            state.get_decision("u1"),
+            state.load_client_user().name,
+        )
+        await store.close()
+        return result
+
+    asyncio.run(first_run())
+    assert asyncio.run(second_run()) == (
+        "2022-06-23T00:00:00.000Z",
+        "Alice",
+        "Carol",
+        None,
+        "like",
+        "Bob",
+    )
+
+
+def test_known_match_is_not_new_after_restart(tmp_path):
+    async def main():
+        store = SQLiteStateStore(tmp_path / "state.db")
+        state = make_state(store)
+        state.store_match({"_id": "m1"})
+        await state.checkpoint()
+        await store.close()
+
+        store = SQLiteStateStore(tmp_path / "state.db")
+        events = []
+        message = {"_id": "msg1", "match_id": "m1", "from": "u1", "message": "hi"}
+        make_state(store, events).parse_updates({"matches": [{"_id": "m1", "messages": [message]}]})
+        await store.close()
+        return events
+
+    assert asyncio.run(main()) == ["message"]
+
+
+def test_stored_match_removal_is_dispatched_after_restart(tmp_path):
+    async def main():
+        store = SQLiteStateStore(tmp_path / "state.db")
+        state = make_state(store)
+        state.store_match({"_id": "m1"})
+        state.store_match({"_id": "m2"})
+        await state.checkpoint()
+        await store.close()
+
+        store = SQLiteStateStore(tmp_path / "state.db")
+        events = []
+        state = ConnectionState(
+            dispatch=lambda *args: events.append(args),
+            handlers={},
+            http=None,
+            loop=None,
+            state_store=store,
+        )
+        state.parse_updates({"matches": [{"_id": "m1", "closed": True}], "blocks": ["m2"]})
+        await state.checkpoint()
+        await store.close()
+
+        store = SQLiteStateStore(tmp_path / "state.db")
+        remaining = [store.get_match("m1"), store.get_match("m2")]
+        await store.close()
+        return events, remaining
+
+    events, remaining = asyncio.run(main())
+    assert [event[0] for event in events] == ["match_remove", "block"]
+    assert events[0][1].id == "m1"
+    assert events[1][1] == "m2"
+    assert remaining == [None, None]
@@ -0,0 +1,26 @@
+import asyncio
+
+import aiohttp
+
+import tinder
+
+
+def test_sync_loop_survives_errors():
+    async def main():
+        client = tinder.Client(loop=asyncio.get_running_loop(), sync_interval=0.01)
+        client._sync.max_interval = 0.01
+        errors = [aiohttp.ServerDisconnectedError(), ValueError("bad json"), KeyError("matches")]
+        calls = []
+
+        async def update(last_activity_date=""):
+            calls.append(last_activity_date)
+            if errors:
+                raise errors.pop(0)
+            await client.close()
+            return {"last_activity_date": "2022-06-23T00:00:00.000Z"}
+
+        client.http.update = update
+        await asyncio.wait_for(client._sync.run(), 5)
+        return calls
+
+    assert len(asyncio.run(main())) == 4
@@ -0,0 +1,47 @@
+import asyncio
+
+from tinder.utils import LRUCache, _bounded_as_completed
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+    cache["c"] = 3
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == (3, 0, 2, 2)
+
+
+def test_lru_cache_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(10, ttl=5.0, clock=clock)
+    cache["a"] = 1
+    clock.now = 6.0
+    assert cache.get("a") is None
+    assert cache.stats().misses == 1
+    assert len(cache) == 0
+
+
+def test_bounded_as_completed_survives_cancelled_items():
+    async def main():
+        async def func(item):
+            if item == 1:
+                raise asyncio.CancelledError()
+            return item
+
+        return [pair async for pair in _bounded_as_completed(func, range(6), concurrency=2)]
+
+    results = asyncio.run(asyncio.wait_for(main(), 5))
+    by_item = dict(results)
+    assert isinstance(by_item.pop(1), asyncio.CancelledError)
+    assert by_item == {0: 0, 2: 2, 3: 3, 4: 4, 5: 5}
@@ -5,6 +5,10 @@ __license__ = "GPL-3.0-or-later"
 
 import logging
 
+from .cache import AssetCache
+from .columns import UserColumns, UserView
+from .journal import DecisionJournal
+from .store import SQLiteStateStore, StateStore
 from .client import Client
 
 from logging import NullHandler
@@ -0,0 +1,36 @@
+import random
+from typing import Callable
+
+
+class ExponentialBackoff:
+    """Exponential backoff with full jitter.
+
+    Each call to :meth:`delay` doubles the upper bound, up to ``maximum``,
+    and returns a random delay below it so that many clients failing at the
+    same time do not retry in lockstep.
+
+    Args:
+        base (float): upper bound of the first delay, in seconds.
+        maximum (float): cap of the upper bound, in seconds.
+    """
+
+    def __init__(
+        self,
+        base: float = 1.0,
+        maximum: float = 60.0,
+        *,
+        rand: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self.base: float = base
+        self.maximum: float = maximum
+        self._rand: Callable[[float, float], float] = rand
+        self._exp: int = 0
+
+    def delay(self) -> float:
+        bound = min(self.maximum, self.base * 2**self._exp)
+        if bound < self.maximum:
+            self._exp += 1
+        return self._rand(0, bound)
+
+    def reset(self) -> None:
+        self._exp = 0
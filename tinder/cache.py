@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+
+class _Entry(NamedTuple):
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    validated_at: float
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class AssetCache:
+    """On-disk cache of asset bodies.
+
+    Entries are keyed by asset id and size (or by URL for assets without an
+    id), so the signed URLs changing between responses do not defeat the
+    cache. Entries younger than ``max_age`` are served without a request;
+    older ones are revalidated with ``If-None-Match``/``If-Modified-Since``.
+    The least recently used entries are evicted once the cache holds more
+    than ``max_bytes``.
+
+    Args:
+        directory: where the cache lives, created if missing.
+        max_bytes (int): maximum total size of the cached bodies.
+        max_age (float): seconds an entry is served without revalidation.
+    """
+
+    def __init__(
+        self,
+        directory: "os.PathLike[str] | str",
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 24 * 60 * 60,
+    ) -> None:
+        self.directory: str = os.fspath(directory)
+        self.max_bytes: int = max_bytes
+        self.max_age: float = max_age
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+        self._entries: Optional[OrderedDict[str, _Entry]] = None
+        self._total: int = 0
+        self._load_lock: asyncio.Lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def key_for(asset) -> str:
+        if asset.id:
+            name = f"{asset.id}:{asset.size or 'original'}"
+        else:
+            name = asset.url
+        return hashlib.sha1(name.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _scan(self) -> OrderedDict[str, _Entry]:
+        found = []
+        os.makedirs(self.directory, exist_ok=True)
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".meta"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, "rb") as f:
+                        meta = json.loads(f.read())
+                    entry = _Entry(
+                        meta["size"],
+                        meta.get("etag"),
+                        meta.get("last_modified"),
+                        meta["validated_at"],
+                    )
+                except (OSError, ValueError, KeyError):
+                    continue
+                found.append((os.stat(path).st_mtime, name[:-5], entry))
+        found.sort()
+        return OrderedDict((key, entry) for _, key, entry in found)
+
+    async def _ensure_loaded(self) -> OrderedDict[str, _Entry]:
+        if self._entries is None:
+            async with self._load_lock:
+                if self._entries is None:
+                    entries = await asyncio.to_thread(self._scan)
+                    self._total = sum(entry.size for entry in entries.values())
+                    self._entries = entries
+        return self._entries
+
+    def _store(self, key: str, data: bytes, entry: _Entry) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, data)
+        self._store_meta(key, entry)
+
+    def _store_meta(self, key: str, entry: _Entry) -> None:
+        _write_atomic(self._path(key) + ".meta", json.dumps(entry._asdict()).encode())
+
+    def _remove(self, key: str) -> None:
+        path = self._path(key)
+        for p in (path, path + ".meta"):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+
+    async def _put(self, key: str, data: bytes, entry: _Entry) -> None:
+        entries = await self._ensure_loaded()
+        await asyncio.to_thread(self._store, key, data, entry)
+        old = entries.pop(key, None)
+        if old is not None:
+            self._total -= old.size
+        entries[key] = entry
+        self._total += entry.size
+        evicted = []
+        while self._total > self.max_bytes and len(entries) > 1:
+            old_key, old = entries.popitem(last=False)
+            self._total -= old.size
+            evicted.append(old_key)
+        for old_key in evicted:
+            await asyncio.to_thread(self._remove, old_key)
+
+    async def _revalidated(self, key: str, entry: _Entry) -> None:
+        # The body is unchanged, only its metadata needs rewriting.
+        await asyncio.to_thread(self._store_meta, key, entry)
+        entries = await self._ensure_loaded()
+        if key in entries:
+            entries[key] = entry
+            entries.move_to_end(key)
+
+    async def read(self, asset, http) -> bytes:
+        """Read an asset through the cache.
+
+        Concurrent reads of the same asset share a single lookup and fetch.
+
+        Args:
+            asset (:class:`tinder.models.Asset`): the asset to read.
+            http (:class:`tinder.http.HTTPClient`): client used on misses.
+
+        Returns:
+            The asset body.
+        """
+        key = self.key_for(asset)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._read(key, asset, http))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _read(self, key: str, asset, http) -> bytes:
+        entries = await self._ensure_loaded()
+        entry = entries.get(key)
+        now = time.time()
+        if entry is not None:
+            if now - entry.validated_at < self.max_age:
+                try:
+                    data = await asyncio.to_thread(_read_file, self._path(key))
+                except OSError:
+                    pass
+                else:
+                    entries.move_to_end(key)
+                    self.hits += 1
+                    return data
+            self.revalidations += 1
+            status, data, headers = await http.get_asset_conditional(
+                asset.url, etag=entry.etag, last_modified=entry.last_modified
+            )
+            if status == 304:
+                try:
+                    data = await asyncio.to_thread(_read_file, self._path(key))
+                except OSError:
+                    status, data, headers = await http.get_asset_conditional(asset.url)
+                else:
+                    self.hits += 1
+                    await self._revalidated(key, entry._replace(validated_at=now))
+                    return data
+        else:
+            status, data, headers = await http.get_asset_conditional(asset.url)
+        self.misses += 1
+        entry = _Entry(len(data), headers.get("ETag"), headers.get("Last-Modified"), now)
+        await self._put(key, data, entry)
+        return data
+
+    async def clear(self) -> None:
+        """Remove every cached entry."""
+        entries = await self._ensure_loaded()
+        keys = list(entries)
+        entries.clear()
+        self._total = 0
+        for key in keys:
+            await asyncio.to_thread(self._remove, key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "size": len(self._entries or ()),
+            "bytes": self._total,
+            "max_bytes": self.max_bytes,
+        }
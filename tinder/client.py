@@ -1,14 +1,25 @@
 import asyncio
 import logging
+import os
 import signal
 import sys
 import traceback
 
-from typing import List, Union
-from .gateway import TinderWebSocket
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+
+from .backoff import ExponentialBackoff
+from .dispatch import EventDispatcher
+from .errors import HTTPException
+from .gateway import ReconnectGateway, TinderWebSocket
 from .http import HTTPClient
-from .models import Asset, ClientUser, User
+from .iterators import MatchIterator, MessageIterator, RecsIterator
+from .models import Asset, ClientUser, Match, Message, User
 from .state import ConnectionState
+from .supervisor import TaskSupervisor
+from .sync import SyncEngine
+from .utils import _bounded_as_completed, _from_json
 
 log = logging.getLogger(__name__)
 
@@ -37,8 +48,32 @@ class Client:
         self.proxy = options.pop("proxy", None)
         self.proxy_auth = options.pop("proxy_auth", None)
         self._listeners = {}
+        self._event_handlers = {}
+        self._tasks = TaskSupervisor(self.loop)
+        self.shutdown_timeout: float = options.pop("shutdown_timeout", 10.0)
+        dispatch_workers = options.pop("dispatch_workers", None)
+        self._dispatcher: Optional[EventDispatcher] = None
+        if dispatch_workers is not None:
+            self._dispatcher = EventDispatcher(
+                self._run_event,
+                workers=dispatch_workers,
+                max_queue=options.pop("dispatch_max_queue", 1000),
+            )
         self.http = HTTPClient(
-            self.connector, proxy=self.proxy, proxy_auth=self.proxy_auth, loop=self.loop
+            self.connector,
+            proxy=self.proxy,
+            proxy_auth=self.proxy_auth,
+            loop=self.loop,
+            max_connections=options.pop("max_connections", 100),
+            max_connections_per_host=options.pop("max_connections_per_host", 0),
+            keepalive_timeout=options.pop("keepalive_timeout", 30.0),
+            dns_cache_ttl=options.pop("dns_cache_ttl", 300),
+            json_loads=options.pop("json_loads", _from_json),
+            retry_policy=options.pop("retry_policy", None),
+            retry_policies=options.pop("retry_policies", None),
+            response_cache_ttl=options.pop("response_cache_ttl", 0.0),
+            metrics=options.pop("metrics", None),
+            trace_configs=options.pop("trace_configs", None),
         )
         self._ready = asyncio.Event()
         self._handlers = {"ready": self._handle_ready}
@@ -49,11 +84,29 @@ class Client:
             loop=self.loop,
             **options,
         )
-        self.ws = TinderWebSocket(self)  # FIXME: throwing exception
+        self.ws = TinderWebSocket(self)
+        self._handlers["heartbeat_ack"] = self.ws.ack
+        self._sync = SyncEngine(
+            self,
+            interval=options.pop("sync_interval", 30.0),
+            max_interval=options.pop("sync_max_interval", 300.0),
+        )
+        self._handlers["nudge"] = self._sync.nudge
+        self._closed = False
+        self._gateway_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
 
     def is_ready(self):
         return self._ready.is_set()
 
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def latency(self) -> float:
+        """:class:`float`: Gateway heartbeat latency in seconds, ``inf`` if unknown."""
+        return self.ws.latency
+
     async def _run_event(self, coro, event_name, *args, **kwargs):
         try:
             await coro(*args, **kwargs)
@@ -70,10 +123,24 @@ class Client:
         traceback.print_exc()
 
     def _schedule_event(self, coro, event_name, *args, **kwargs):
+        if self._dispatcher is not None:
+            return self._dispatcher.submit(coro, event_name, *args, **kwargs)
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
-        return _ClientEventTask(
+        task = _ClientEventTask(
             original_coro=coro, event_name=event_name, coro=wrapped, loop=self.loop
         )
+        return self._tasks.track(task)
+
+    def dispatch_stats(self):
+        """Get the state of the event dispatch queue.
+
+        Returns:
+            A :class:`tinder.dispatch.DispatchStats`, or ``None`` when handlers
+            run as independent tasks (no ``dispatch_workers`` option).
+        """
+        if self._dispatcher is None:
+            return None
+        return self._dispatcher.stats()
 
     async def wait_until_ready(self):
         await self._ready.wait()
@@ -95,50 +162,154 @@ class Client:
         log.debug("Dispatching %s", event)
         method = "on_" + event
 
-        listeners = self._listeners.get(event)
+        listeners = self._listeners.pop(event, None)
         if listeners:
-            removed = []
-            for i, (future, condition) in enumerate(listeners):
-                if future.cancelled():
-                    removed.append(i)
+            pending = []
+            for future, condition in listeners:
+                if future.done():
                     continue
 
                 try:
                     result = condition(*args)
-                except Exception as exec:
-                    future.set_exception(exec)
-                    removed.append(i)
-                else:
-                    if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
-                        removed.append(i)
-
-                if len(removed) == len(listeners):
-                    self._listeners.pop(event)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+
+                if not result:
+                    pending.append((future, condition))
+                elif len(args) == 0:
+                    future.set_result(None)
+                elif len(args) == 1:
+                    future.set_result(args[0])
                 else:
-                    for idx in reversed(removed):
-                        del listeners[idx]
+                    future.set_result(args)
+
+            # A condition may have registered new listeners for this event.
+            added = self._listeners.pop(event, None)
+            if added:
+                pending.extend(added)
+            if pending:
+                self._listeners[event] = pending
 
         try:
-            coro = getattr(self, method)
-        except AttributeError:
-            pass
-        else:
+            coro = self._event_handlers[method]
+        except KeyError:
+            coro = self._event_handlers[method] = getattr(self, method, None)
+        if coro is not None:
             self._schedule_event(coro, method, *args, **kwargs)
 
-    async def close(self) -> None:
+    async def close(self, *, timeout: Optional[float] = None) -> None:
+        """Shut the client down.
+
+        New work is refused first: the sync loop stops, the gateway is closed
+        so no new events arrive, and new likes or skips raise
+        :exc:`tinder.errors.ClientException`. Likes and skips in flight,
+        queued messages and queued events then get until the deadline to
+        finish. Whatever is left is cancelled before the HTTP session is
+        closed.
+
+        Args:
+            timeout (Optional[float]): seconds to wait for pending work,
+                defaults to the ``shutdown_timeout`` option (10 seconds).
+        """
+        if self._closed:
+            return
         log.debug("Closing client")
+        self._closed = True
+        timeout = self.shutdown_timeout if timeout is None else timeout
+        deadline = self.loop.time() + timeout
+        for task in (self._gateway_task, self._sync_task):
+            if task is not None:
+                task.cancel()
+        self._gateway_task = self._sync_task = None
+        await self.ws.close()
+
+        pending = [self.http.drain(), self._connection.outbox.flush()]
+        if self._dispatcher is not None:
+            pending.append(self._dispatcher.join())
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if not await self._tasks.wait(max(deadline - self.loop.time(), 0)):
+            log.warning(
+                "Shutdown deadline of %.1f seconds reached, cancelling pending work.", timeout
+            )
+
+        await self._tasks.cancel()
+        await self._connection.outbox.close()
+        if self._connection.decision_journal is not None:
+            self._connection.decision_journal.close()
+        store = self._connection.state_store
+        if store is not None:
+            await self.checkpoint()
+            await store.close()
+        if self._dispatcher is not None:
+            await self._dispatcher.close()
         await self.http.close()
 
+    @property
+    def user(self) -> Optional[ClientUser]:
+        """Optional[:class:`ClientUser`]: The logged in user, if fetched or kept in the state store."""
+        return self._connection.load_client_user()
+
+    async def checkpoint(self) -> None:
+        """Save the state changes made since the last checkpoint to the ``state_store``.
+
+        Checkpoints are also taken after every sync and on :meth:`close`.
+        Failures are logged, the changes are kept for the next checkpoint.
+        """
+        try:
+            await self._connection.checkpoint()
+        except Exception:
+            log.exception("Saving the state failed.")
+
+    def pool_stats(self):
+        """Get the current usage of the HTTP connection pool.
+
+        Returns:
+            A :class:`tinder.http.PoolStats` snapshot.
+        """
+        return self.http.pool_stats()
+
     async def connect(self, *, reconnect=True) -> None:
-        if self.ws:
-            coro = self.ws.connect()
-            self.ws = await asyncio.wait_for(coro, timeout=60.0)
+        """Keep the gateway connected.
+
+        Dead connections, detected by a heartbeat going unanswered for
+        ``heartbeat_timeout`` seconds, are closed and re-established with a
+        jittered exponential backoff. The gateway token is only fetched again
+        when the server rejects it.
+
+        Args:
+            reconnect (bool): whether to reconnect instead of returning when
+                the connection is lost.
+        """
+        backoff = ExponentialBackoff()
+        refresh_token = False
+        while not self.is_closed():
+            connected_at = None
+            try:
+                await asyncio.wait_for(self.ws.connect(refresh_token=refresh_token), timeout=60.0)
+                refresh_token = False
+                connected_at = self.loop.time()
+                log.debug("Gateway connected.")
+                self.dispatch("connect")
+                await self.ws.receive()
+            except ReconnectGateway as exc:
+                refresh_token = exc.refresh_token
+                log.info("Gateway disconnected: %s", exc)
+            except (OSError, asyncio.TimeoutError, aiohttp.ClientError, HTTPException) as exc:
+                log.warning("Gateway connection failed: %r", exc)
+            if connected_at is not None:
+                self.dispatch("disconnect")
+                # Only a connection that held for a while resets the backoff.
+                if self.loop.time() - connected_at > 60.0:
+                    backoff.reset()
+            if not reconnect or self.is_closed():
+                return
+            delay = backoff.delay()
+            log.info("Reconnecting to the gateway in %.2f seconds.", delay)
+            await asyncio.sleep(delay)
 
     async def login(self, token) -> None:
         log.debug("Logging in")
@@ -148,25 +319,38 @@ class Client:
         log.debug("Starting client")
 
         reconnect = kwargs.pop("reconnect", True)
+        sync = kwargs.pop("sync", True)
 
         await self.login(*args)
-        # await self.connect(reconnect=reconnect)
+        self._gateway_task = self._tasks.spawn(
+            self.connect(reconnect=reconnect), name="tinder-gateway"
+        )
+        if sync:
+            self._sync_task = self._tasks.spawn(self._sync.run(), name="tinder-sync")
 
     async def main(self) -> None:
         pass
 
+    async def sync(self) -> bool:
+        """Fetch ``/updates`` once and apply it to the local state.
+
+        Returns:
+            Whether anything changed.
+        """
+        return await self._sync.sync()
+
     def _handle_ready(self) -> None:
         log.debug("Ready event!")
         self._ready.set()
 
     def run(self, *args, **kwargs):
+        """Start the client and block until :meth:`main` returns or a
+        termination signal is received.
 
+        SIGINT and SIGTERM cancel :meth:`main` and :meth:`close` then drains
+        pending work before the loop stops.
+        """
         loop = self.loop
-        try:
-            loop.add_signal_handler(signal.SIGINT, lambda: loop.stop())
-            loop.add_signal_handler(signal.SIGTERM, lambda: loop.stop())
-        except NotImplementedError:
-            pass
 
         async def runner():
             try:
@@ -180,12 +364,23 @@ class Client:
 
         future = asyncio.ensure_future(runner(), loop=loop)
         future.add_done_callback(stop_loop_on_completion)
+        signals = (signal.SIGINT, signal.SIGTERM)
+        try:
+            for signum in signals:
+                loop.add_signal_handler(signum, future.cancel)
+        except NotImplementedError:
+            signals = ()
         try:
             loop.run_forever()
         except KeyboardInterrupt:
             print("Received terminate signal")
+            future.remove_done_callback(stop_loop_on_completion)
+            future.cancel()
+            loop.run_until_complete(asyncio.wait([future]))
         finally:
             future.remove_done_callback(stop_loop_on_completion)
+            for signum in signals:
+                loop.remove_signal_handler(signum)
 
         if not future.cancelled():
             try:
@@ -198,29 +393,260 @@ class Client:
             raise TypeError("event registered must be a coroutine function")
 
         setattr(self, coro.__name__, coro)
+        self._event_handlers[coro.__name__] = coro
         log.debug("%s has successfully been registered as an event", coro.__name__)
         return coro
 
-    async def fetch_user_profile(self, user_id: Union[str, int]) -> User:
-        data = await self.http.get_user_profile(user_id)
+    def _decide_many(
+        self,
+        action: str,
+        users: Union[Iterable[User], AsyncIterable[User]],
+        concurrency: int,
+    ) -> AsyncIterator[Tuple[User, Any]]:
+        async def decide(user):
+            return await getattr(user, action)()
+
+        return _bounded_as_completed(decide, users, concurrency=concurrency)
+
+    def like_many(
+        self, users: Union[Iterable[User], AsyncIterable[User]], *, concurrency: int = 8
+    ) -> AsyncIterator[Tuple[User, Any]]:
+        """Like several users concurrently.
+
+        Requests go through the same rate limit buckets as :meth:`User.like`.
+        A failure only affects its own user.
+
+        Args:
+            users: the users to like, an iterable or async iterable.
+            concurrency (int): maximum number of requests in flight.
+
+        Yields:
+            ``(user, result)`` tuples in completion order, where ``result`` is
+            the response data, ``None`` for a user already decided on, or the
+            exception raised for that user.
+        """
+        return self._decide_many("like", users, concurrency)
+
+    def skip_many(
+        self, users: Union[Iterable[User], AsyncIterable[User]], *, concurrency: int = 8
+    ) -> AsyncIterator[Tuple[User, Any]]:
+        """Pass several users concurrently.
+
+        See :meth:`like_many` for the semantics.
+
+        Args:
+            users: the users to pass, an iterable or async iterable.
+            concurrency (int): maximum number of requests in flight.
+
+        Yields:
+            ``(user, result)`` tuples in completion order.
+        """
+        return self._decide_many("skip", users, concurrency)
+
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Get a user from the cache.
+
+        Args:
+            user_id (str): the id of the user.
+
+        Returns:
+            The cached user, or ``None`` if it is unknown or expired.
+        """
+        return self._connection.get_user(user_id)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the internal caches.
+
+        Returns:
+            A mapping of cache name to its counters, a :class:`tinder.utils.CacheStats`
+            for in-memory caches and a dict for the asset cache.
+        """
+        return self._connection.cache_stats()
+
+    def download_many(
+        self,
+        assets: Union[Iterable[Asset], AsyncIterable[Asset]],
+        dest: Union[str, os.PathLike],
+        *,
+        size: Optional[str] = None,
+        concurrency: int = 4,
+    ) -> AsyncIterator[Tuple[Asset, Any]]:
+        """Download several assets into a directory.
+
+        Files are streamed to disk and partial downloads left by an earlier run
+        are resumed. Files already present are not downloaded again.
+
+        Args:
+            assets: the assets to download, an iterable or async iterable.
+            dest: the destination directory, created if missing.
+            size (Optional[str]): minimum ``"{width}x{height}"``; the smallest
+                rendition covering it is downloaded instead of the original.
+            concurrency (int): maximum number of downloads in flight.
+
+        Yields:
+            ``(asset, result)`` tuples in completion order, where ``result`` is
+            the path written or the exception raised for that asset.
+        """
+        directory = os.fspath(dest)
+
+        async def download(asset: Asset) -> str:
+            if size is not None:
+                asset = asset.rendition(size)
+            path = os.path.join(directory, asset.filename)
+            if not await asyncio.to_thread(os.path.exists, path):
+                await asset.save(path, resume=True)
+            return path
+
+        async def run():
+            await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+            async for item in _bounded_as_completed(download, assets, concurrency=concurrency):
+                yield item
+
+        return run()
+
+    async def fetch_user_profile(self, user_id: Union[str, int], *, cached: bool = True) -> User:
+        if cached:
+            user = self._connection.get_user(str(user_id))
+            if user is not None:
+                return user
+        data = await self.http.get_user_profile(user_id, cached=cached)
         log.debug("Fetched user profile.")
-        return User(self._connection, data=data["results"])
+        return self._connection.store_user(User(self._connection, data=data["results"]))
 
     async def fetch_profile(self) -> ClientUser:
         data = await self.http.get_profile()
         log.debug("Fetched client profile.")
-        return ClientUser(self._connection, data=data)
+        return self._connection.store_client_user(data)
 
     async def fetch_recs(self) -> List[User]:
         data = await self.http.get_recs()
-        users = [User(self._connection, data=user_data) for user_data in data["results"]]
+        state = self._connection
+        users = [
+            state.store_user(User(state, data=user_data)) for user_data in data.get("results", [])
+        ]
         log.debug(f"Fetched {len(users)} user records.")
         return users
 
     async def fetch_recs2(self) -> List[User]:
         data = await self.http.get_recs2()
-        log.debug("Fetched records v2.")
-        raise NotImplementedError
+        state = self._connection
+        users = []
+        for result in data.get("data", {}).get("results", []):
+            if result.get("type", "user") != "user":
+                continue
+            user_data = dict(result["user"], distance_mi=result.get("distance_mi", 0))
+            users.append(state.store_user(User(state, data=user_data)))
+        log.debug(f"Fetched {len(users)} user records (v2).")
+        return users
+
+    def recs(
+        self,
+        *,
+        version: int = 1,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+        delay: float = 60.0,
+    ) -> RecsIterator:
+        """Iterate over recommended users, page after page.
+
+        The next page is fetched in the background while the current one is
+        consumed. Users repeated across pages are only yielded once.
+
+        Args:
+            version (int): 1 for ``/user/recs``, 2 for ``/v2/recs/core``.
+            limit (Optional[int]): stop after this many users, ``None`` for no limit.
+            prefetch (bool): whether to fetch one page ahead.
+            delay (float): seconds to wait before retrying when no users are available.
+
+        Returns:
+            An async iterator of :class:`User`.
+        """
+        if version not in (1, 2):
+            raise ValueError("version must be 1 or 2")
+        fetch = self.fetch_recs if version == 1 else self.fetch_recs2
+        return RecsIterator(fetch, loop=self.loop, limit=limit, prefetch=prefetch, delay=delay)
+
+    def get_match(self, match_id: str) -> Optional[Match]:
+        """Get a match from the local state.
+
+        Args:
+            match_id (str): the id of the match.
+
+        Returns:
+            The match, or ``None`` if it is not known.
+        """
+        return self._connection.get_match(match_id)
+
+    def matches(
+        self,
+        *,
+        count: int = 60,
+        message: int = 0,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> MatchIterator:
+        """Iterate over all the client's matches, page after page.
+
+        The next page is fetched in the background while the current one is
+        consumed, and every match is stored in the local state.
+
+        Args:
+            count (int): matches per page.
+            message (int): 1 for matches with messages, 0 for those without.
+            limit (Optional[int]): stop after this many matches, ``None`` for all.
+            prefetch (bool): whether to fetch one page ahead.
+
+        Returns:
+            An async iterator of :class:`Match`.
+        """
+        return MatchIterator(
+            self._connection,
+            loop=self.loop,
+            count=count,
+            message=message,
+            limit=limit,
+            prefetch=prefetch,
+        )
+
+    def messages(
+        self,
+        match_id: str,
+        *,
+        count: int = 100,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> MessageIterator:
+        """Iterate over the messages of a match, newest first.
+
+        Every message is stored in the local history cache of the match.
+
+        Args:
+            match_id (str): the id of the match.
+            count (int): messages per page.
+            limit (Optional[int]): stop after this many messages, ``None`` for all.
+            prefetch (bool): whether to fetch one page ahead.
+
+        Returns:
+            An async iterator of :class:`Message`.
+        """
+        return MessageIterator(
+            self._connection, match_id, loop=self.loop, count=count, limit=limit, prefetch=prefetch
+        )
+
+    async def send_message(self, match_id: str, content: str) -> Message:
+        """Send a message to a match.
+
+        Messages are queued per match and sent in order; failed sends are
+        retried without sending the same message twice.
+
+        Args:
+            match_id (str): the id of the match.
+            content (str): the message body.
+
+        Returns:
+            The sent message.
+        """
+        return await self._connection.outbox.send(match_id, content)
 
     async def fetch_teasers(self) -> List[Asset]:
         data = await self.http.get_teasers()
@@ -228,5 +654,6 @@ class Client:
         for user in data["data"]["results"]:
             for photo_data in user["user"]["photos"]:
                 teasers.append(Asset(self._connection, data=photo_data))
+        self._connection.store_teasers(teasers)
         log.debug(f"Fetched {len(teasers)} teasers.")
         return teasers
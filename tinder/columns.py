@@ -0,0 +1,214 @@
+import sys
+import uuid
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .types import UserPayload
+
+_ID_BYTES = 12
+_PHOTO_BYTES = 16
+_NO_DISTANCE = -1
+
+
+class UserView:
+    """A read-only view of a user kept in :class:`UserColumns`.
+
+    Views are created on demand and hold nothing but their row, so they are
+    cheap to create and to throw away.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: "UserColumns", row: int) -> None:
+        self._columns = columns
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._columns._get_id(self._row)
+
+    @property
+    def name(self) -> str:
+        columns = self._columns
+        return columns._strings[columns._names[self._row]]
+
+    @property
+    def distance_mi(self) -> Optional[int]:
+        distance = self._columns._distances[self._row]
+        return None if distance == _NO_DISTANCE else distance
+
+    @property
+    def photo_ids(self) -> Tuple[str, ...]:
+        """Tuple[:class:`str`]: The ids of the user's photos, in profile order."""
+        return self._columns._get_photo_ids(self._row)
+
+    def matches_teaser(self) -> bool:
+        """Check whether one of the user's photos is a known teaser."""
+        state = self._columns.state
+        return state is not None and state.matches_teaser(self.photo_ids)
+
+    def __eq__(self, other):
+        return isinstance(other, UserView) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return "<UserView name={0.name!r}>".format(self)
+
+
+class UserColumns:
+    """Compact storage for a large number of seen users.
+
+    Only the id, name, distance and photo ids of each user are kept, as
+    columns: hexadecimal user ids and UUID photo ids are packed as raw bytes,
+    names are interned in a string table and numbers live in :mod:`array`
+    columns. A user with six photos takes a few hundred bytes, mostly for the
+    id index, instead of several kilobytes for a :class:`tinder.models.User`
+    and its assets.
+
+    When passed to :class:`tinder.Client` as the ``user_columns`` option, every
+    user stored in the state is also recorded here.
+
+    Args:
+        state (Optional[:class:`tinder.state.ConnectionState`]): state used by
+            :meth:`UserView.matches_teaser`.
+    """
+
+    def __init__(self, state=None) -> None:
+        self.state = state
+        self._index: Dict[Union[bytes, str], int] = {}
+        self._ids = bytearray()
+        self._odd_ids: Dict[int, str] = {}
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self._names = array("I")
+        self._distances = array("i")
+        self._photo_start = array("I")
+        self._photo_count = array("B")
+        self._photos = bytearray()
+        self._odd_photos: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, user_id: str) -> bool:
+        return self._key(user_id) in self._index
+
+    def __iter__(self) -> Iterator[UserView]:
+        return (UserView(self, row) for row in range(len(self)))
+
+    @staticmethod
+    def _key(user_id: str) -> Union[bytes, str]:
+        if len(user_id) == _ID_BYTES * 2:
+            try:
+                key = bytes.fromhex(user_id)
+            except ValueError:
+                pass
+            else:
+                # Only the canonical form round-trips through the packed bytes.
+                if key.hex() == user_id:
+                    return key
+        return user_id
+
+    def _intern(self, value: str) -> int:
+        try:
+            return self._string_index[value]
+        except KeyError:
+            index = self._string_index[value] = len(self._strings)
+            self._strings.append(value)
+            return index
+
+    def _get_id(self, row: int) -> str:
+        odd = self._odd_ids.get(row)
+        if odd is not None:
+            return odd
+        start = row * _ID_BYTES
+        return self._ids[start : start + _ID_BYTES].hex()
+
+    def _get_photo_ids(self, row: int) -> Tuple[str, ...]:
+        first = self._photo_start[row]
+        photos = self._photos
+        odd = self._odd_photos
+        result = []
+        for index in range(first, first + self._photo_count[row]):
+            if index in odd:
+                result.append(odd[index])
+            else:
+                start = index * _PHOTO_BYTES
+                result.append(str(uuid.UUID(bytes=bytes(photos[start : start + _PHOTO_BYTES]))))
+        return tuple(result)
+
+    def _append_photos(self, photo_ids: List[str]) -> int:
+        first = len(self._photos) // _PHOTO_BYTES
+        for index, photo_id in enumerate(photo_ids, first):
+            try:
+                packed = uuid.UUID(photo_id).bytes
+            except ValueError:
+                packed = bytes(_PHOTO_BYTES)
+                self._odd_photos[index] = photo_id
+            else:
+                # Only the canonical form round-trips through the packed bytes.
+                if str(uuid.UUID(bytes=packed)) != photo_id:
+                    self._odd_photos[index] = photo_id
+            self._photos += packed
+        return first
+
+    def add(self, user) -> UserView:
+        """Record a user, updating its row if it was already recorded.
+
+        Args:
+            user: a :class:`tinder.models.User` or a raw user payload.
+
+        Returns:
+            A view of the stored row.
+        """
+        data: UserPayload = user if isinstance(user, dict) else user._data
+        user_id = data["_id"]
+        name = self._intern(data.get("name", ""))
+        distance = data.get("distance_mi")
+        distance = _NO_DISTANCE if distance is None else distance
+        photo_ids = [photo["id"] for photo in data.get("photos", [])][:255]
+
+        key = self._key(user_id)
+        row = self._index.get(key)
+        if row is None:
+            row = self._index[key] = len(self)
+            if isinstance(key, bytes):
+                self._ids += key
+            else:
+                self._ids += bytes(_ID_BYTES)
+                self._odd_ids[row] = user_id
+            self._names.append(name)
+            self._distances.append(distance)
+            self._photo_start.append(self._append_photos(photo_ids))
+            self._photo_count.append(len(photo_ids))
+        else:
+            self._names[row] = name
+            self._distances[row] = distance
+            if self._get_photo_ids(row) != tuple(photo_ids):
+                # The old block is left unused: photos rarely change.
+                self._photo_start[row] = self._append_photos(photo_ids)
+                self._photo_count[row] = len(photo_ids)
+        return UserView(self, row)
+
+    def get(self, user_id: str) -> Optional[UserView]:
+        row = self._index.get(self._key(user_id))
+        return None if row is None else UserView(self, row)
+
+    def nbytes(self) -> int:
+        """Estimate the memory used by the columns, in bytes."""
+        size = sys.getsizeof(self._index) + sum(sys.getsizeof(key) for key in self._index)
+        size += sys.getsizeof(self._string_index) + sys.getsizeof(self._strings)
+        size += sum(sys.getsizeof(string) for string in self._strings)
+        size += sys.getsizeof(self._odd_ids) + sys.getsizeof(self._odd_photos)
+        for column in (
+            self._ids,
+            self._names,
+            self._distances,
+            self._photo_start,
+            self._photo_count,
+            self._photos,
+        ):
+            size += sys.getsizeof(column)
+        return size
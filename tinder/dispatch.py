@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class DispatchStats(NamedTuple):
+    queued: int
+    running: int
+    high_water: int
+    processed: int
+    workers: int
+
+
+class EventDispatcher:
+    """Runs event handlers on a fixed pool of workers.
+
+    Events are queued in the order they are dispatched and handled by at most
+    ``workers`` handlers at a time. Queuing never blocks, so ``dispatch`` can
+    stay synchronous; producers that can wait, such as the gateway reader,
+    apply backpressure with :meth:`wait_for_capacity` once ``max_queue``
+    events are waiting.
+
+    Args:
+        run (Callable): coroutine function running one handler, called with
+            ``(coro, event_name, *args, **kwargs)``.
+        workers (int): handlers running concurrently.
+        max_queue (int): queue depth above which producers are held back.
+    """
+
+    def __init__(self, run: Callable, *, workers: int = 8, max_queue: int = 1000) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.run: Callable = run
+        self.workers: int = workers
+        self.max_queue: int = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._has_capacity: Optional[asyncio.Event] = None
+        self._running: int = 0
+        self._high_water: int = 0
+        self._processed: int = 0
+
+    def _start(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._has_capacity = asyncio.Event()
+        self._has_capacity.set()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        return self._queue
+
+    def submit(self, coro: Callable, event_name: str, *args: Any, **kwargs: Any) -> None:
+        """Queue a handler call."""
+        queue = self._queue if self._queue is not None else self._start()
+        queue.put_nowait((coro, event_name, args, kwargs))
+        depth = queue.qsize()
+        if depth > self._high_water:
+            self._high_water = depth
+        if depth >= self.max_queue:
+            self._has_capacity.clear()  # type: ignore
+
+    async def wait_for_capacity(self) -> None:
+        """Wait until the queue is below ``max_queue``."""
+        if self._has_capacity is not None and not self._has_capacity.is_set():
+            log.debug("Dispatch queue full (%d events), holding back.", self.queue_depth)
+            await self._has_capacity.wait()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> DispatchStats:
+        return DispatchStats(
+            self.queue_depth, self._running, self._high_water, self._processed, len(self._tasks)
+        )
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self) -> None:
+        queue: asyncio.Queue = self._queue  # type: ignore
+        while True:
+            item: Tuple[Callable, str, tuple, dict] = await queue.get()
+            if queue.qsize() < self.max_queue:
+                self._has_capacity.set()  # type: ignore
+            coro, event_name, args, kwargs = item
+            self._running += 1
+            try:
+                await self.run(coro, event_name, *args, **kwargs)
+            except Exception:
+                log.exception("Unhandled exception in %s.", event_name)
+            finally:
+                self._running -= 1
+                self._processed += 1
+                queue.task_done()
+
+    async def close(self) -> None:
+        """Stop the workers, dropping the events still queued."""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        if self._has_capacity is not None:
+            self._has_capacity.set()
+            self._has_capacity = None
@@ -27,6 +27,10 @@ class NotFound(HTTPException):
     pass
 
 
+class TooManyRequests(HTTPException):
+    pass
+
+
 class InvalidData(ClientException):
     pass
 
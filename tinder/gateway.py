@@ -1,37 +1,232 @@
 import aiohttp
 import asyncio
 import logging
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 log = logging.getLogger(__name__)
 
+FieldValue = Union[int, memoryview]
+
+# Field numbers of the top-level keepalive frame. The schema is not public:
+# only the heartbeat (field 5, empty) is known, any other frame is taken as a
+# nudge that something changed server side.
+HEARTBEAT_FIELD = 5
+HEARTBEAT = bytes.fromhex("2a00")
+
+
+def _read_varint(buf: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = buf[pos]
+        except IndexError:
+            raise ValueError("truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise ValueError("varint too long")
+
+
+def iter_fields(buf: memoryview) -> Iterator[Tuple[int, FieldValue]]:
+    """Iterate over the ``(field number, value)`` pairs of a protobuf message.
+
+    Varints and fixed-width values are returned as :class:`int`, length
+    delimited values as :class:`memoryview` slices of ``buf`` (no copy).
+    """
+    pos = 0
+    end = len(buf)
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 0x07
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            value = int.from_bytes(buf[pos : pos + 8], "little")
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            if pos + length > end:
+                raise ValueError("truncated length-delimited field")
+            value = buf[pos : pos + length]
+            pos += length
+        elif wire_type == 5:
+            value = int.from_bytes(buf[pos : pos + 4], "little")
+            pos += 4
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
+        if pos > end:
+            raise ValueError("truncated field")
+        yield field, value
+
+
+class GatewayMessage:
+    """A decoded keepalive frame.
+
+    Attributes:
+        fields: the top-level fields, mapping field numbers to their values.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        fields: Dict[int, List[FieldValue]] = {}
+        for field, value in iter_fields(memoryview(data)):
+            fields.setdefault(field, []).append(value)
+        self.fields: Dict[int, List[FieldValue]] = fields
+
+    def get(self, field: int) -> Optional[FieldValue]:
+        values = self.fields.get(field)
+        return values[-1] if values else None
+
+    def message(self, field: int) -> Optional["GatewayMessage"]:
+        """Decode a length delimited field as a nested message."""
+        value = self.get(field)
+        if isinstance(value, memoryview):
+            return GatewayMessage(value)
+        return None
+
+    @property
+    def is_heartbeat(self) -> bool:
+        return list(self.fields) == [HEARTBEAT_FIELD]
+
+    def __repr__(self):
+        return "<GatewayMessage fields={0}>".format(sorted(self.fields))
+
+
+class ReconnectGateway(Exception):
+    """Raised internally when the gateway connection must be re-established.
+
+    Attributes:
+        refresh_token (bool): whether the gateway token was rejected.
+    """
+
+    def __init__(self, reason: str, *, refresh_token: bool = False):
+        self.refresh_token: bool = refresh_token
+        super().__init__(reason)
+
 
 class TinderWebSocket:
+    # Close codes the server uses when it does not accept the token.
+    TOKEN_REJECTED_CODES = frozenset({1008, 4001, 4003, 4004})
+
     def __init__(self, client):
         self.client = client
-        self.url: str
-        self.ws: aiohttp.ClientWebSocketResponse
+        self.url: Optional[str] = None
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self.heartbeat_interval: float = 30.0
+        self._last_send: float = 0.0
+        self._last_ack: float = 0.0
+        self._last_recv: float = 0.0
+        self._latency: float = float("inf")
+        self._ping_task: Optional[asyncio.Task] = None
+
+    @property
+    def latency(self) -> float:
+        """:class:`float`: Seconds between the last heartbeat and its ack, ``inf`` if unknown."""
+        return self._latency
+
+    @property
+    def heartbeat_timeout(self) -> float:
+        return self.client._connection.heartbeat_timeout
+
+    def is_open(self) -> bool:
+        return self.ws is not None and not self.ws.closed
 
     async def fetch_token(self):
         resp = await self.client.http.fetch_gateway()
         return resp["token"]
 
-    async def connect(self):
-        self.url = await self.client.http.get_gateway()
-        self.ws = await self.client.http.ws_connect(self.url)
+    async def connect(self, *, refresh_token: bool = False):
+        """Open the gateway, fetching a new token only when needed.
+
+        Args:
+            refresh_token (bool): discard the cached token and fetch a new one.
+        """
+        if self.url is None or refresh_token:
+            self.url = await self.client.http.get_gateway()
+        try:
+            self.ws = await self.client.http.ws_connect(self.url)
+        except aiohttp.WSServerHandshakeError as exc:
+            if exc.status in (401, 403):
+                self.url = None
+                raise ReconnectGateway("gateway token rejected", refresh_token=True) from exc
+            raise
+        now = self.client.loop.time()
+        self._last_send = self._last_ack = self._last_recv = now
+        self._ping_task = self.client._tasks.spawn(self.ping(), name="tinder-gateway-ping")
 
-        self.client.loop.create_task(self.ping())
-        self.client.loop.create_task(self.receive())
+    def ack(self) -> None:
+        self._last_ack = self.client.loop.time()
+        self._latency = self._last_ack - self._last_send
+        log.debug("Gateway heartbeat acknowledged in %.3f seconds.", self._latency)
+
+    def received_message(self, data: bytes) -> None:
+        self._last_recv = self.client.loop.time()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Gateway message received: %s", data.hex())
+        self.client.dispatch("socket_raw_receive", data)
+        try:
+            message = GatewayMessage(data)
+        except ValueError:
+            log.warning("Ignoring malformed gateway frame of %d bytes.", len(data))
+            return
+        self.client._connection.parse_gateway_message(message)
 
     async def receive(self):
-        while True:
-            resp = await self.ws.receive()
-            try:
-                resp = resp.data.hex()
-                log.debug(f"Gateway message received: {resp}")
-            except AttributeError:
-                log.debug(f"Gateway received: {resp}")
+        """Receive frames until the connection ends.
+
+        Raises:
+            ReconnectGateway: the connection was closed or found dead.
+        """
+        try:
+            while True:
+                msg = await self.ws.receive()
+                if msg.type is aiohttp.WSMsgType.BINARY:
+                    self.received_message(msg.data)
+                elif msg.type is aiohttp.WSMsgType.TEXT:
+                    self.received_message(msg.data.encode())
+                elif msg.type in (
+                    aiohttp.WSMsgType.CLOSE,
+                    aiohttp.WSMsgType.CLOSING,
+                    aiohttp.WSMsgType.CLOSED,
+                    aiohttp.WSMsgType.ERROR,
+                ):
+                    code = self.ws.close_code
+                    log.debug("Gateway closed with code %s: %s", code, msg)
+                    if code in self.TOKEN_REJECTED_CODES:
+                        self.url = None
+                        raise ReconnectGateway("gateway token rejected", refresh_token=True)
+                    raise ReconnectGateway(f"gateway closed with code {code}")
+                dispatcher = self.client._dispatcher
+                if dispatcher is not None:
+                    await dispatcher.wait_for_capacity()
+        finally:
+            await self.close()
 
     async def ping(self):
-        while True:
-            await self.ws.send_bytes(bytearray.fromhex("2a00"))
-            await asyncio.sleep(30)
+        while self.is_open():
+            # Any frame received after the heartbeat proves the connection alive.
+            if self._last_recv < self._last_send:
+                elapsed = self.client.loop.time() - self._last_send
+                if elapsed > self.heartbeat_timeout:
+                    log.warning(
+                        "Gateway silent for %.1f seconds after heartbeat, reconnecting.",
+                        elapsed,
+                    )
+                    await self.ws.close(code=4000)
+                    return
+            else:
+                await self.ws.send_bytes(HEARTBEAT)
+                self._last_send = self.client.loop.time()
+            await asyncio.sleep(min(self.heartbeat_interval, self.heartbeat_timeout))
+
+    async def close(self, code: int = 1000) -> None:
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+        if self.ws is not None and not self.ws.closed:
+            await self.ws.close(code=code)
@@ -1,39 +1,163 @@
 import asyncio
+import functools
 import logging
-from typing import Optional, Any, Dict, Coroutine
+import sys
+from contextlib import asynccontextmanager
+from string import Formatter
+from typing import Optional, Any, AsyncIterator, Callable, Dict, Coroutine, NamedTuple
 from urllib.parse import quote as _uriquote
 
 import aiohttp
-from .errors import Forbidden, HTTPException, NotFound
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+from .errors import ClientException, Forbidden, HTTPException, NotFound, TooManyRequests
+from .metrics import MetricsSink, RequestTrace, create_trace_config
+from .retry import RetryPolicy
+from .utils import LRUCache, _from_json, _parse_retry_after
 
 log: logging.Logger = logging.getLogger(__name__)
 
 
-async def json_or_text(response) -> Dict[str, Any] | str:
+async def json_or_text(
+    response, *, loads: Callable[[bytes], Any] = _from_json
+) -> Optional[Dict[str, Any]] | str:
     try:
         if "application/json" in response.headers["content-type"]:
-            return await response.json()
+            body = await response.read()
+            # Like ``ClientResponse.json()``, an empty body decodes to None.
+            return loads(body) if body.strip() else None
     except KeyError:
         pass
     return await response.text(encoding="utf-8")
 
 
+class _RouteTemplate:
+    """A route path compiled once into literal chunks and parameter names."""
+
+    __slots__ = ("bucket", "url", "yarl_url", "_parts")
+
+    def __init__(self, base: str, method: str, path: str) -> None:
+        self.bucket: str = sys.intern(f"{method} {path}")
+        self._parts: tuple[tuple[str, Optional[str]], ...] = tuple(
+            (literal, field) for literal, field, _, _ in Formatter().parse(base + path)
+        )
+        self.url: Optional[str] = None
+        self.yarl_url: Optional[URL] = None
+        if all(field is None for _, field in self._parts):
+            self.url = sys.intern(base + path)
+            self.yarl_url = URL(self.url, encoded=True)
+
+    def expand(self, params: dict[str, Any]) -> str:
+        chunks: list[str] = []
+        for literal, field in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                value = params[field]
+                chunks.append(_uriquote(value) if isinstance(value, str) else str(value))
+        return "".join(chunks)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_route(base: str, method: str, path: str) -> _RouteTemplate:
+    return _RouteTemplate(base, method, path)
+
+
 class Route:
     BASE = "https://api.gotinder.com"
 
+    __slots__ = ("path", "method", "bucket", "url", "_url")
+
     def __init__(self, method, path, **params) -> None:
         self.path = path
         self.method = method
-        url: str = self.BASE + self.path
-        if params:
-            self.url = url.format(
-                **{k: _uriquote(v) if isinstance(v, str) else v for k, v in params.items()}
-            )
+        template = _compile_route(self.BASE, method, path)
+        self.bucket: str = template.bucket
+        if params or template.url is None:
+            self.url: str = template.expand(params)
+            self._url: Optional[URL] = None
         else:
-            self.url = url
+            self.url = template.url
+            self._url = template.yarl_url
+
+    @property
+    def yarl_url(self) -> URL:
+        """The route URL as an already encoded :class:`yarl.URL`."""
+        if self._url is None:
+            self._url = URL(self.url, encoded=True)
+        return self._url
+
+
+class RateLimit:
+    """Rate limit state shared by every request to the same bucket.
+
+    Requests run concurrently while the bucket has budget left. Once it is
+    exhausted (``X-RateLimit-Remaining: 0`` or a 429), callers queue on the
+    bucket and go out one at a time after the reset, until a successful
+    response reopens it.
+    """
+
+    __slots__ = ("bucket", "remaining", "reset_at", "_lock", "_loop")
+
+    def __init__(self, bucket: str, *, loop: asyncio.AbstractEventLoop) -> None:
+        self.bucket: str = bucket
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop = loop
+
+    def is_exhausted(self) -> bool:
+        return self.remaining == 0
+
+    def block(self, delay: float) -> None:
+        """Mark the bucket as exhausted for ``delay`` seconds."""
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, self._loop.time() + delay)
+
+    def update(self, response: aiohttp.ClientResponse) -> None:
+        """Update the bucket from the rate limit headers of a successful response."""
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            self.remaining = None
+            return
+        try:
+            self.remaining = int(remaining)
+        except ValueError:
+            self.remaining = None
+            return
+        if self.remaining == 0:
+            delay = _parse_retry_after(headers.get("X-RateLimit-Reset-After"), default=1.0)
+            self.reset_at = max(self.reset_at, self._loop.time() + delay)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if not self.is_exhausted():
+            yield
+            return
+        async with self._lock:
+            delay = self.reset_at - self._loop.time()
+            if delay > 0:
+                log.debug("Bucket %s is rate limited, waiting %.2f seconds.", self.bucket, delay)
+                await asyncio.sleep(delay)
+            yield
+
+    def __repr__(self) -> str:
+        return "<RateLimit bucket={0.bucket!r} remaining={0.remaining!r}>".format(self)
+
+
+class PoolStats(NamedTuple):
+    """Snapshot of the connection pool usage."""
+
+    in_use: int
+    idle: int
+    waiters: int
+    limit: int
+    limit_per_host: int
 
 
 class HTTPClient:
+    GATEWAY = "wss://keepalive.gotinder.com/ws"
+
     def __init__(
         self,
         connector: Optional[aiohttp.BaseConnector] = None,
@@ -41,15 +165,45 @@ class HTTPClient:
         proxy: Optional[str] = None,
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+        json_loads: Callable[[bytes], Any] = _from_json,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_policies: Optional[dict[str, RetryPolicy]] = None,
+        response_cache_ttl: float = 0.0,
+        metrics: Optional[MetricsSink] = None,
+        trace_configs: Optional[list[aiohttp.TraceConfig]] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = loop or asyncio.get_event_loop()
         self.connector: Optional[aiohttp.BaseConnector] = connector
-        self.__session: aiohttp.ClientSession
+        self._connector_owner: bool = connector is None
+        self.max_connections: int = max_connections
+        self.max_connections_per_host: int = max_connections_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.json_loads: Callable[[bytes], Any] = json_loads
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.retry_policies: dict[str, RetryPolicy] = dict(retry_policies or {})
+        self.metrics: Optional[MetricsSink] = metrics
+        self.trace_configs: list[aiohttp.TraceConfig] = list(trace_configs or [])
+        if metrics is not None:
+            self.trace_configs.append(create_trace_config())
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self._durable: set[asyncio.Task] = set()
+        self._draining: bool = False
+        self._response_cache: Optional[LRUCache[tuple, Any]] = (
+            LRUCache(256, response_cache_ttl) if response_cache_ttl > 0 else None
+        )
+        self.__session: Optional[aiohttp.ClientSession] = None
         self.token: Optional[str] = None
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
-        self.__global_over: asyncio.Event = asyncio.Event()
-        self.__global_over.set()
+        self._global_over: asyncio.Event = asyncio.Event()
+        self._global_over.set()
+        self._ratelimits: dict[str, RateLimit] = {}
+        self._headers: CIMultiDictProxy[str] = self._build_headers()
         self.user_agent: str = " ".join(
             [
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -58,67 +212,363 @@ class HTTPClient:
             ]
         )
 
+    def _create_connector(self) -> aiohttp.BaseConnector:
+        # aiohttp already sets TCP_NODELAY on every connection it opens.
+        return aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.dns_cache_ttl is not None,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        if self.connector is None or self.connector.closed:
+            self.connector = self._create_connector()
+            self._connector_owner = True
+        # The session does not own the connector so that recreating it keeps
+        # the pool (and its warm TLS connections) alive.
+        return aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            trace_configs=self.trace_configs or None,
+        )
+
+    def _build_headers(self) -> CIMultiDictProxy[str]:
+        headers: CIMultiDict[str] = CIMultiDict(
+            {
+                "app_version": "6.9.4",
+                "platform": "ios",
+                "Content-Type": "application/json",
+                "User-Agent": "Tinder/7.5.3 (iPhone; iOs 10.3.2; Scale/2.00)",
+                "Accept": "application/json",
+            }
+        )
+        if self.token:
+            headers["X-Auth-Token"] = self.token
+        return CIMultiDictProxy(headers)
+
     async def login(self, token) -> None:
-        self.__session = aiohttp.ClientSession(connector=self.connector)
+        if self.__session is None or self.__session.closed:
+            self.__session = self._create_session()
         self.token = token
+        self._headers = self._build_headers()
+        self._draining = False
 
     async def close(self) -> None:
-        if self.__session:
+        for task in list(self._durable):
+            task.cancel()
+        if self.__session is not None and not self.__session.closed:
             await self.__session.close()
+        if self._connector_owner and self.connector is not None:
+            await self.connector.close()
+            self.connector = None
 
     async def recreate(self) -> None:
-        if self.__session and self.__session.closed:
-            self.__session = aiohttp.ClientSession(connector=self.connector)
+        if self.__session is not None and self.__session.closed:
+            self.__session = self._create_session()
+
+    def pool_stats(self) -> PoolStats:
+        """Get the current usage of the connection pool.
+
+        Returns:
+            A :class:`PoolStats` snapshot, all zeros before login.
+        """
+        connector = self.connector
+        if connector is None:
+            return PoolStats(0, 0, 0, self.max_connections, self.max_connections_per_host)
+        conns = getattr(connector, "_conns", {})
+        waiters = getattr(connector, "_waiters", {})
+        return PoolStats(
+            in_use=len(getattr(connector, "_acquired", ())),
+            idle=sum(len(c) for c in conns.values()),
+            waiters=sum(len(w) for w in waiters.values()),
+            limit=connector.limit,
+            limit_per_host=connector.limit_per_host,
+        )
+
+    @staticmethod
+    def _asset_error(resp: aiohttp.ClientResponse) -> HTTPException:
+        if resp.status == 404:
+            return NotFound(resp, "asset not found")
+        elif resp.status == 403:
+            return Forbidden(resp, "cannot retrieve asset")
+        else:
+            return HTTPException(resp, "failed to get asset")
 
     async def get_asset(self, url) -> bytes:
         async with self.__session.get(url) as resp:
             if resp.status == 200:
                 return await resp.read()
-            elif resp.status == 404:
-                raise NotFound(resp, "asset not found")
-            elif resp.status == 403:
-                raise Forbidden(resp, "cannot retrieve asset")
-            else:
-                raise HTTPException(resp, "failed to get asset")
-
-    async def request(self, route: Route, **kwargs) -> dict[str, Any] | str:
+            raise self._asset_error(resp)
+
+    async def get_asset_conditional(
+        self, url: str, *, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> tuple[int, bytes, CIMultiDictProxy[str]]:
+        """Get an asset unless it is unchanged.
+
+        Args:
+            url (str): the asset URL.
+            etag (Optional[str]): validator sent as ``If-None-Match``.
+            last_modified (Optional[str]): validator sent as ``If-Modified-Since``.
+
+        Returns:
+            The status (200 or 304), the body (empty on 304) and the response headers.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        async with self.__session.get(url, headers=headers or None) as resp:
+            if resp.status == 304:
+                return resp.status, b"", resp.headers
+            if resp.status == 200:
+                return resp.status, await resp.read(), resp.headers
+            raise self._asset_error(resp)
+
+    @asynccontextmanager
+    async def stream_asset(
+        self, url: str, *, offset: int = 0, if_range: Optional[str] = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open an asset for streaming its body.
+
+        Args:
+            url (str): the asset URL.
+            offset (int): byte offset to resume from. The server may ignore it
+                and answer 200 with the whole asset, or 416 if nothing is left.
+            if_range (Optional[str]): ETag or Last-Modified of the partial
+                body, so that a changed asset is sent whole with a 200.
+
+        Yields:
+            The response, with status 200, 206 or (when resuming) 416.
+        """
+        headers = None
+        if offset:
+            headers = {"Range": f"bytes={offset}-"}
+            if if_range:
+                headers["If-Range"] = if_range
+        async with self.__session.get(url, headers=headers) as resp:
+            if resp.status not in (200, 206) and not (offset and resp.status == 416):
+                raise self._asset_error(resp)
+            yield resp
+
+    def get_ratelimit(self, bucket: str) -> RateLimit:
+        """Get the rate limit state of a bucket, creating it if needed."""
+        try:
+            return self._ratelimits[bucket]
+        except KeyError:
+            ratelimit = RateLimit(bucket, loop=self.loop)
+            self._ratelimits[bucket] = ratelimit
+            return ratelimit
+
+    def get_retry_policy(self, route: Route) -> RetryPolicy:
+        """Get the retry policy of a route, falling back to the client's."""
+        return self.retry_policies.get(route.bucket, self.retry_policy)
+
+    def _coalesce_key(self, route: Route, kwargs: dict[str, Any]) -> Optional[tuple]:
+        if route.method != "GET" or kwargs.keys() - {"params"}:
+            return None
+        params = kwargs.get("params")
+        return (route.url, tuple(sorted(params.items())) if params else ())
+
+    def _finish_inflight(self, key: tuple, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is None and self._response_cache is not None:
+            self._response_cache[key] = task.result()
+
+    def _finish_durable(self, task: asyncio.Task) -> None:
+        self._durable.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.debug("Durable request failed: %r", task.exception())
+
+    async def drain(self) -> None:
+        """Refuse new durable requests and wait for those in flight."""
+        self._draining = True
+        while self._durable:
+            await asyncio.wait(set(self._durable))
+
+    async def request(
+        self,
+        route: Route,
+        *,
+        retry: Optional[RetryPolicy] = None,
+        durable: bool = False,
+        coalesce: bool = False,
+        **kwargs,
+    ) -> dict[str, Any] | str:
+        """Send a request to the API.
+
+        With ``coalesce``, concurrent identical GET requests (same URL and
+        params, no custom headers or body) share a single HTTP call, and
+        their responses are kept for ``response_cache_ttl`` seconds when it
+        is set. The data returned may then be shared between callers and
+        must not be mutated.
+
+        Args:
+            route (Route): the route to request.
+            retry (Optional[RetryPolicy]): policy overriding the route's.
+            durable (bool): finish the request even if the caller is
+                cancelled, so that :meth:`drain` can wait for it on shutdown.
+            coalesce (bool): share the response with identical requests.
+                Only for routes whose data is safe to reuse for a while.
+
+        Raises:
+            ClientException: a durable request was made while draining.
+
+        Returns:
+            Response data.
+        """
+        if durable:
+            if self._draining:
+                raise ClientException("the client is shutting down")
+            task = self.loop.create_task(self._request(route, retry=retry, **kwargs))
+            self._durable.add(task)
+            task.add_done_callback(self._finish_durable)
+            return await asyncio.shield(task)
+        key = self._coalesce_key(route, kwargs) if coalesce else None
+        if key is None:
+            return await self._request(route, retry=retry, **kwargs)
+        if self._response_cache is not None:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = self.loop.create_task(self._request(route, retry=retry, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish_inflight, key))
+        else:
+            log.debug("Joining in-flight request to %s.", route.url)
+        return await asyncio.shield(task)
+
+    async def _request(
+        self, route: Route, *, retry: Optional[RetryPolicy] = None, **kwargs
+    ) -> dict[str, Any] | str:
         method = route.method
-        url = route.url
+        ratelimit = self.get_ratelimit(route.bucket)
+        policy = retry or self.get_retry_policy(route)
         headers: Optional[dict[str, str]] = kwargs.get("headers")
         if headers is None:
-            headers = {
-                "app_version": "6.9.4",
-                "platform": "ios",
-                "Content-Type": "application/json",
-                "User-Agent": "Tinder/7.5.3 (iPhone; iOs 10.3.2; Scale/2.00)",
-                "Accept": "application/json",
-            }
-        if self.token:
-            headers["X-Auth-Token"] = self.token
-        if "json" in kwargs:
-            headers["Content-Type"] = "application/json"
-        kwargs["headers"] = headers
+            kwargs["headers"] = self._headers
+        else:
+            if self.token:
+                headers["X-Auth-Token"] = self.token
+            if "json" in kwargs:
+                headers["Content-Type"] = "application/json"
         if self.proxy:
             kwargs["proxy"] = self.proxy
         elif self.proxy_auth:
             kwargs["proxy_auth"] = self.proxy_auth
-        if not self.__global_over.is_set():
-            await self.__global_over.wait()
-        for tries in range(3):
-            async with self.__session.request(method, url, **kwargs) as r:
-                data: dict[str, Any] | str = await json_or_text(r)
-                if 300 > r.status >= 200:
-                    return data
-                elif r.status in {500, 502}:
-                    await asyncio.sleep(1 + tries * 2)
-                    continue
-                elif r.status == 403:
-                    raise Forbidden(r, data)
-                elif r.status == 404:
-                    raise NotFound(r, data)
-                else:
-                    raise HTTPException(r, data)
-        raise RuntimeError("Unreachable code in HTTP handling")
+        if policy.timeout is not None:
+            kwargs.setdefault("timeout", policy.timeout)
+        started_at = self.loop.time()
+        trace = RequestTrace(route.bucket, method) if self.metrics is not None else None
+        if trace is not None:
+            kwargs["trace_request_ctx"] = trace
+        try:
+            return await self._request_attempts(route, policy, ratelimit, trace, kwargs)
+        except BaseException as exc:
+            if trace is not None:
+                trace.error = type(exc).__name__
+            raise
+        finally:
+            if trace is not None:
+                trace.latency = self.loop.time() - started_at
+                self.metrics.on_request(trace)  # type: ignore
+
+    async def _request_attempts(
+        self,
+        route: Route,
+        policy: RetryPolicy,
+        ratelimit: RateLimit,
+        trace: Optional[RequestTrace],
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any] | str:
+        method = route.method
+        url = route.yarl_url
+        deadline = self.loop.time() + policy.deadline if policy.deadline is not None else None
+        delays = policy.delays()
+        attempts = 0
+        rate_limited = 0
+        while True:
+            waiting_since = self.loop.time()
+            if not self._global_over.is_set():
+                await self._global_over.wait()
+            attempts += 1
+            delay = None
+            try:
+                async with ratelimit.acquire():
+                    if trace is not None:
+                        trace.ratelimit_wait += self.loop.time() - waiting_since
+                        trace.attempts += 1
+                    async with self.__session.request(method, url, **kwargs) as r:
+                        if trace is not None:
+                            trace.status = r.status
+                        data: dict[str, Any] | str = await json_or_text(r, loads=self.json_loads)
+                        if 300 > r.status >= 200:
+                            ratelimit.update(r)
+                            return data
+                        elif r.status == 429:
+                            rate_limited += 1
+                            attempts -= 1
+                            if trace is not None:
+                                trace.rate_limited += 1
+                            retry_after = _parse_retry_after(
+                                r.headers.get("Retry-After"), default=1 + rate_limited * 2
+                            )
+                            is_global = "X-RateLimit-Global" in r.headers or (
+                                isinstance(data, dict) and data.get("global", False)
+                            )
+                            log.warning(
+                                "Rate limited on %s, retrying in %.2f seconds (global: %s).",
+                                route.bucket,
+                                retry_after,
+                                is_global,
+                            )
+                            ratelimit.block(retry_after)
+                            if rate_limited == 5:
+                                raise TooManyRequests(r, data)
+                            if is_global:
+                                self._global_over.clear()
+                                self.loop.call_later(retry_after, self._global_over.set)
+                            continue
+                        if policy.should_retry_status(method, r.status):
+                            delay = next(delays)
+                            if attempts >= policy.max_attempts or (
+                                deadline is not None and self.loop.time() + delay > deadline
+                            ):
+                                delay = None
+                        if delay is None:
+                            if r.status == 403:
+                                raise Forbidden(r, data)
+                            elif r.status == 404:
+                                raise NotFound(r, data)
+                            else:
+                                raise HTTPException(r, data)
+                        log.warning(
+                            "%s %s returned %s, retrying in %.2f seconds.",
+                            method,
+                            route.bucket,
+                            r.status,
+                            delay,
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as exc:
+                if not policy.should_retry_error(method, exc) or attempts >= policy.max_attempts:
+                    raise
+                delay = next(delays)
+                if deadline is not None and self.loop.time() + delay > deadline:
+                    raise
+                log.warning(
+                    "%s %s failed with %r, retrying in %.2f seconds.",
+                    method,
+                    route.bucket,
+                    exc,
+                    delay,
+                )
+            await asyncio.sleep(delay)
 
     def fetch_gateway(self) -> Coroutine:
         headers: dict[str, Optional[str]] = {
@@ -136,7 +586,7 @@ class HTTPClient:
 
     async def get_gateway(self) -> str:
         token: str = (await self.fetch_gateway())["token"]
-        return f"wss://keepalive.gotinder.com/ws?token={token}"
+        return f"{self.GATEWAY}?token={token}"
 
     async def ws_connect(self, url: str, *, compress: int = 0) -> aiohttp.ClientWebSocketResponse:
         kwargs: dict[str, Any] = {
@@ -161,16 +611,18 @@ class HTTPClient:
         """
         return self.request(Route("GET", "/profile"))
 
-    def get_user_profile(self, user_id: str | int) -> Coroutine:
+    def get_user_profile(self, user_id: str | int, *, cached: bool = True) -> Coroutine:
         """Get a user's profile.
 
         Args:
             user_id (Union[str, int]): the id of the user.
+            cached (bool): allow a coalesced or recently cached response.
 
         Returns:
             Response data.
         """
-        return self.request(Route("GET", "/user/{user_id}", user_id=user_id))
+        route = Route("GET", "/user/{user_id}", user_id=user_id)
+        return self.request(route, coalesce=cached)
 
     def get_recs(self) -> Coroutine:
         """Get new records.
@@ -206,7 +658,7 @@ class HTTPClient:
         Returns:
             Response data.
         """
-        return self.request(Route("POST", "/like/{user_id}", user_id=user_id))
+        return self.request(Route("POST", "/like/{user_id}", user_id=user_id), durable=True)
 
     def skip(self, user_id: str | int) -> Coroutine:
         """Pass a user.
@@ -217,7 +669,7 @@ class HTTPClient:
         Returns:
             Response data.
         """
-        return self.request(Route("POST", "/pass/{user_id}", user_id=user_id))
+        return self.request(Route("POST", "/pass/{user_id}", user_id=user_id), durable=True)
 
     # untested:
 
@@ -234,17 +686,22 @@ class HTTPClient:
         params: dict[str, str] = {"locale": "en"}
         return self.request(Route("PUT", "/v2/push/notifications"), params=params)
 
-    def matches(self, count: int = 60, message: int = 0) -> Coroutine:
+    def matches(
+        self, count: int = 60, message: int = 0, page_token: Optional[str] = None
+    ) -> Coroutine:
         """Get matches of the client.
 
         Args:
             count (int): number of matches.
             message (int): message option 0 or 1.
+            page_token (Optional[str]): token of the page to get, from the previous page.
 
         Returns:
             Response data.
         """
         params: dict[str, str | int] = {"locale": "en", "count": count, "message": message}
+        if page_token:
+            params["page_token"] = page_token
         return self.request(Route("GET", "/v2/matches"), params=params)
 
     def explore(self) -> Coroutine:
@@ -286,9 +743,29 @@ class HTTPClient:
         Returns:
             Response data.
         """
-        payload = {"message", message}
+        payload: dict[str, str] = {"message": message}
         return self.request(
-            Route("POST", "/user/matches/{match_id}", match_id=match_id), data=payload
+            Route("POST", "/user/matches/{match_id}", match_id=match_id), json=payload
+        )
+
+    def get_messages(
+        self, match_id: str, count: int = 100, page_token: Optional[str] = None
+    ) -> Coroutine:
+        """Get messages of a match, newest first.
+
+        Args:
+            match_id (str): the id of the match.
+            count (int): number of messages.
+            page_token (Optional[str]): token of the page to get, from the previous page.
+
+        Returns:
+            Response data.
+        """
+        params: dict[str, str | int] = {"locale": "en", "count": count}
+        if page_token:
+            params["page_token"] = page_token
+        return self.request(
+            Route("GET", "/v2/matches/{match_id}/messages", match_id=match_id), params=params
         )
 
     def likes_count(self) -> Coroutine:
@@ -299,14 +776,19 @@ class HTTPClient:
         """
         return self.request(Route("POST", "/v2/fast-match/count"))
 
-    def update(self) -> Coroutine:
+    def update(self, last_activity_date: str = "") -> Coroutine:
         """Get updates.
 
+        Args:
+            last_activity_date (str): cursor returned by the previous call, empty
+                to get everything.
+
         Returns:
             Response data.
         """
         params: dict[str, str] = {"locale": "en"}
-        return self.request(Route("GET", "/updates"), params=params)
+        payload: dict[str, str | bool] = {"nudge": True, "last_activity_date": last_activity_date}
+        return self.request(Route("POST", "/updates"), params=params, json=payload)
 
     def meta(self, lat: float, lon: float, force_fetch_resources: bool = True) -> Coroutine:
 
@@ -329,7 +811,4 @@ class HTTPClient:
         return self.request(Route("POST", "/v2/meta"), params=params, data=payload)
 
     # TODO: support endpoints
-    # https://api.gotinder.com/v2/matches/{id}/messages
-    # https://api.gotinder.com/user/matches/{id}
-    # https://api.gotinder.com/v2/matches
     # https://api.gotinder.com/like/id/super?locale=en POST
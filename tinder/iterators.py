@@ -0,0 +1,203 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Generic, List, Optional, Tuple, TypeVar
+
+from .utils import LRUCache
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _PaginatedIterator(Generic[T]):
+    """Async iterator over a paginated resource.
+
+    While a page is being consumed the next one is already being fetched in
+    the background, but never more than one page ahead, so a slow consumer
+    does not make the iterator run ahead of it. Leaving an ``async for`` loop
+    early cancels that background fetch; iterating again resumes where the
+    loop stopped.
+    """
+
+    def __init__(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self.limit: Optional[int] = limit
+        self.prefetch: bool = prefetch
+        self._buffer: Deque[T] = deque()
+        self._next_page: Optional[asyncio.Task] = None
+        self._exhausted: bool = False
+        self._yielded: int = 0
+
+    async def _fetch_page(self) -> Tuple[List[T], bool]:
+        """Fetch the next page, returning its items and whether more pages follow."""
+        raise NotImplementedError
+
+    async def _get_page(self) -> List[T]:
+        task = self._next_page
+        self._next_page = None
+        if task is None:
+            task = self.loop.create_task(self._fetch_page())
+        items, has_more = await task
+        if not has_more:
+            self._exhausted = True
+        elif self.prefetch:
+            self._next_page = self.loop.create_task(self._fetch_page())
+        return items
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        # An async generator is finalized when the loop using it is left, even
+        # by break, which a plain async iterator is not.
+        try:
+            while True:
+                try:
+                    item = await self.__anext__()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            self._cancel_prefetch()
+
+    async def __anext__(self) -> T:
+        if self.limit is not None and self._yielded >= self.limit:
+            self.close()
+            raise StopAsyncIteration
+        while not self._buffer:
+            if self._exhausted:
+                raise StopAsyncIteration
+            try:
+                self._buffer.extend(await self._get_page())
+            except BaseException:
+                self.close()
+                raise
+        self._yielded += 1
+        return self._buffer.popleft()
+
+    async def flatten(self) -> List[T]:
+        """Consume the iterator into a list."""
+        return [item async for item in self]
+
+    def close(self) -> None:
+        """Stop iterating and cancel the page being prefetched, if any."""
+        self._exhausted = True
+        self._buffer.clear()
+        self._cancel_prefetch()
+
+    async def aclose(self) -> None:
+        """Asynchronous alias of :meth:`close`."""
+        self.close()
+
+    def _cancel_prefetch(self) -> None:
+        if self._next_page is not None:
+            self._next_page.cancel()
+            self._next_page = None
+
+
+class RecsIterator(_PaginatedIterator[Any]):
+    """Endless iterator over recommended users.
+
+    Users already yielded are skipped when a later page repeats them; the
+    ``max_seen`` most recent ids are remembered. When a page brings no new
+    user the iterator waits ``delay`` seconds before asking again.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[List[Any]]],
+        *,
+        loop: asyncio.AbstractEventLoop,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+        delay: float = 60.0,
+        max_seen: int = 10000,
+    ) -> None:
+        super().__init__(loop=loop, limit=limit, prefetch=prefetch)
+        self.fetch: Callable[[], Awaitable[List[Any]]] = fetch
+        self.delay: float = delay
+        self._seen: LRUCache[str, bool] = LRUCache(max_seen)
+
+    async def _fetch_page(self) -> Tuple[List[Any], bool]:
+        while True:
+            users = self._fresh(await self.fetch())
+            if users:
+                return users, True
+            log.debug("No new recommendations, retrying in %s seconds.", self.delay)
+            await asyncio.sleep(self.delay)
+
+    def _fresh(self, users: List[Any]) -> List[Any]:
+        seen = self._seen
+        fresh = []
+        for user in users:
+            if seen.get(user.id) is None:
+                fresh.append(user)
+            seen[user.id] = True
+        return fresh
+
+
+class MatchIterator(_PaginatedIterator[Any]):
+    """Iterator over the client's matches, following the page tokens.
+
+    Every match is stored in the connection state as it is fetched.
+    """
+
+    def __init__(
+        self,
+        state,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        count: int = 60,
+        message: int = 0,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> None:
+        super().__init__(loop=loop, limit=limit, prefetch=prefetch)
+        self.state = state
+        self.count: int = count
+        self.message: int = message
+        self.page_token: Optional[str] = None
+
+    async def _fetch_page(self) -> Tuple[List[Any], bool]:
+        data = await self.state.http.matches(self.count, self.message, self.page_token)
+        data = data.get("data", {})
+        matches = [self.state.store_match(match_data) for match_data in data.get("matches", [])]
+        self.page_token = data.get("next_page_token")
+        return matches, bool(self.page_token)
+
+
+class MessageIterator(_PaginatedIterator[Any]):
+    """Iterator over the messages of a match, newest first.
+
+    Every message is stored in the connection state as it is fetched.
+    """
+
+    def __init__(
+        self,
+        state,
+        match_id: str,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        count: int = 100,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> None:
+        super().__init__(loop=loop, limit=limit, prefetch=prefetch)
+        self.state = state
+        self.match_id: str = match_id
+        self.count: int = count
+        self.page_token: Optional[str] = None
+
+    async def _fetch_page(self) -> Tuple[List[Any], bool]:
+        data = await self.state.http.get_messages(self.match_id, self.count, self.page_token)
+        data = data.get("data", {})
+        messages = [self.state.store_message(m) for m in data.get("messages", [])]
+        self.page_token = data.get("next_page_token")
+        return messages, bool(self.page_token)
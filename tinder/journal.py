@@ -0,0 +1,116 @@
+import logging
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+ACTIONS = frozenset({"like", "skip"})
+
+
+class DecisionJournal:
+    """An on-disk log of the users that were liked or skipped.
+
+    Decisions are kept in a dict and appended to a text file, one
+    ``action<TAB>user_id`` line each, flushed as they are recorded. The file
+    is replayed when the journal is opened; a truncated last line, left by a
+    crash, is cut off. Lines superseded by a later decision on the same user
+    are dropped by :meth:`compact`, which also runs on open once they make up
+    more than half of the file.
+
+    When passed to :class:`tinder.Client` as the ``decision_journal`` option,
+    :meth:`tinder.models.User.like` and :meth:`tinder.models.User.skip` do
+    not send a decision on a user already in the journal.
+
+    Args:
+        path: journal file, created if missing.
+        fsync (bool): also sync the file to disk after each decision.
+    """
+
+    def __init__(self, path: "os.PathLike[str] | str", *, fsync: bool = False) -> None:
+        self.path: str = os.fspath(path)
+        self.fsync: bool = fsync
+        self._decisions: Dict[str, str] = {}
+        self._lines: int = 0
+        self._load()
+        if self._lines > 2 * len(self._decisions):
+            self.compact()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # Drop the partial line left by a crash, so the next record does
+            # not get appended to it.
+            log.warning("Discarding a truncated line at the end of the decision journal.")
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        decisions = self._decisions
+        for line in data[:complete].decode("utf-8", "replace").splitlines():
+            action, _, user_id = line.partition("\t")
+            self._lines += 1
+            if action in ACTIONS and user_id:
+                decisions[user_id] = action
+            else:
+                log.warning("Ignoring malformed decision journal line %d.", self._lines)
+
+    def __enter__(self) -> "DecisionJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._decisions
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._decisions.items())
+
+    def get(self, user_id: str) -> Optional[str]:
+        """Get the decision on a user, ``"like"``, ``"skip"`` or ``None``."""
+        return self._decisions.get(user_id)
+
+    def record(self, user_id: str, action: str) -> None:
+        """Record a decision, appending it to the file unless it is already known.
+
+        The line is written and flushed on the calling thread, which costs a
+        small write into the OS page cache. With ``fsync`` enabled it also
+        waits for the disk, which blocks the event loop for the duration.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action {action!r}")
+        if self._decisions.get(user_id) == action:
+            return
+        self._decisions[user_id] = action
+        self._file.write(f"{action}\t{user_id}\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._lines += 1
+
+    def compact(self) -> None:
+        """Rewrite the file with a single line per user."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{action}\t{user_id}\n" for user_id, action in self._decisions.items())
+            f.flush()
+            os.fsync(f.fileno())
+        reopen = getattr(self, "_file", None) is not None and not self._file.closed
+        if reopen:
+            self._file.close()
+        os.replace(tmp, self.path)
+        self._lines = len(self._decisions)
+        if reopen:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
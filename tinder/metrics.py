@@ -0,0 +1,173 @@
+import bisect
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+
+import aiohttp
+
+#: Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+
+class RequestTrace:
+    """Measurements of one API request, across all its attempts.
+
+    Attributes:
+        bucket (str): route template, such as ``"POST /like/{user_id}"``.
+        method (str): HTTP method.
+        status (Optional[int]): status of the last response, ``None`` if none came.
+        latency (float): seconds from the call to its outcome, including waits.
+        attempts (int): HTTP calls made.
+        rate_limited (int): 429 responses received.
+        ratelimit_wait (float): seconds spent waiting on the rate limiter.
+        bytes_sent (int): request body bytes sent.
+        bytes_received (int): response body bytes received.
+        error (Optional[str]): name of the exception raised, if any.
+    """
+
+    __slots__ = (
+        "bucket",
+        "method",
+        "status",
+        "latency",
+        "attempts",
+        "rate_limited",
+        "ratelimit_wait",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+    )
+
+    def __init__(self, bucket: str, method: str) -> None:
+        self.bucket: str = bucket
+        self.method: str = method
+        self.status: Optional[int] = None
+        self.latency: float = 0.0
+        self.attempts: int = 0
+        self.rate_limited: int = 0
+        self.ratelimit_wait: float = 0.0
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.error: Optional[str] = None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    def __repr__(self):
+        return (
+            "<RequestTrace bucket={0.bucket!r} status={0.status} latency={0.latency:.3f}>".format(
+                self
+            )
+        )
+
+
+class MetricsSink:
+    """Receives the measurements of every request.
+
+    Subclass it to export to a monitoring system; :meth:`on_request` is
+    called on the event loop once per request and should not block.
+    """
+
+    def on_request(self, trace: RequestTrace) -> None:
+        pass
+
+
+class InMemoryMetrics(MetricsSink):
+    """Aggregates request measurements in memory, per route template."""
+
+    def __init__(self) -> None:
+        self.latency: DefaultDict[str, List[int]] = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self.latency_sum: Counter = Counter()
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.ratelimit_wait: Counter = Counter()
+        self.bytes_sent: Counter = Counter()
+        self.bytes_received: Counter = Counter()
+
+    def on_request(self, trace: RequestTrace) -> None:
+        bucket = trace.bucket
+        self.latency[bucket][bisect.bisect_left(LATENCY_BUCKETS, trace.latency)] += 1
+        self.latency_sum[bucket] += trace.latency
+        self.requests[bucket] += 1
+        if trace.status is not None:
+            self.statuses[bucket, trace.status] += 1
+        if trace.error is not None:
+            self.errors[bucket, trace.error] += 1
+        self.retries[bucket] += trace.retries
+        self.rate_limited[bucket] += trace.rate_limited
+        self.ratelimit_wait[bucket] += trace.ratelimit_wait
+        self.bytes_sent[bucket] += trace.bytes_sent
+        self.bytes_received[bucket] += trace.bytes_received
+
+    def quantile(self, bucket: str, q: float) -> float:
+        """Estimate a latency quantile of a route from its histogram.
+
+        Returns:
+            The upper bound of the histogram bucket holding the quantile.
+        """
+        counts = self.latency.get(bucket)
+        if not counts:
+            return 0.0
+        rank = q * sum(counts)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get the aggregated measurements of every route."""
+        result = {}
+        for bucket, count in self.requests.items():
+            result[bucket] = {
+                "requests": count,
+                "latency_avg": self.latency_sum[bucket] / count,
+                "latency_p50": self.quantile(bucket, 0.5),
+                "latency_p99": self.quantile(bucket, 0.99),
+                "statuses": {s: n for (b, s), n in self.statuses.items() if b == bucket},
+                "errors": {e: n for (b, e), n in self.errors.items() if b == bucket},
+                "retries": self.retries[bucket],
+                "rate_limited": self.rate_limited[bucket],
+                "ratelimit_wait": self.ratelimit_wait[bucket],
+                "bytes_sent": self.bytes_sent[bucket],
+                "bytes_received": self.bytes_received[bucket],
+            }
+        return result
+
+
+async def _on_request_chunk_sent(session, ctx: SimpleNamespace, params) -> None:
+    trace = ctx.trace_request_ctx
+    if isinstance(trace, RequestTrace):
+        trace.bytes_sent += len(params.chunk)
+
+
+async def _on_response_chunk_received(session, ctx: SimpleNamespace, params) -> None:
+    trace = ctx.trace_request_ctx
+    if isinstance(trace, RequestTrace):
+        trace.bytes_received += len(params.chunk)
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Create the :class:`aiohttp.TraceConfig` counting body bytes into a :class:`RequestTrace`."""
+    config = aiohttp.TraceConfig()
+    config.on_request_chunk_sent.append(_on_request_chunk_sent)
+    config.on_response_chunk_received.append(_on_response_chunk_received)
+    return config
@@ -1,2 +1,4 @@
 from .asset import Asset
 from .user import User, ClientUser
+from .match import Match
+from .message import Message
@@ -1,43 +1,147 @@
+import asyncio
 import io
 import os
-from typing import Union
+import posixpath
+from typing import Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 from collections import OrderedDict
 from tinder.errors import TinderException
 from tinder.state import ConnectionState
+from tinder.types import PhotoPayload
 
 
 class Asset:
-    __slots__ = ("_state", "url", "processed", "id")
+    __slots__ = ("_state", "url", "id", "size", "_data", "_processed")
 
-    def __init__(self, state: ConnectionState, *, data=None, url=None):
+    def __init__(
+        self,
+        state: ConnectionState,
+        *,
+        data: Optional[PhotoPayload] = None,
+        url=None,
+        id=None,
+        size=None,
+    ):
         self._state: ConnectionState = state
         self.url = data["url"] if data else url
-        self.processed = OrderedDict()
-        self.id = None
+        self.id = data["id"] if data else id
+        self.size: Optional[str] = size
+        self._data: Optional[PhotoPayload] = data
+        self._processed: Optional[OrderedDict[str, Asset]] = None
 
-        if data:
-            self.id = data["id"]
-            for pf in data["processedFiles"]:
-                key = f"{pf['width']}x{pf['height']}"
-                value = Asset(state, url=pf["url"])
-                self.processed[key] = value
+    @property
+    def processed(self) -> OrderedDict[str, "Asset"]:
+        """OrderedDict[:class:`str`, :class:`Asset`]: The processed renditions keyed by
+        ``"{width}x{height}"``, built from the payload on first access."""
+        if self._processed is None:
+            self._processed = OrderedDict()
+            if self._data:
+                for pf in self._data["processedFiles"]:
+                    key = f"{pf['width']}x{pf['height']}"
+                    self._processed[key] = Asset(self._state, url=pf["url"], id=self.id, size=key)
+        return self._processed
+
+    @property
+    def filename(self) -> str:
+        """:class:`str`: A file name for the asset, from its id and size when known."""
+        path = urlsplit(self.url or "").path
+        ext = posixpath.splitext(path)[1] or ".jpg"
+        if not self.id:
+            return posixpath.basename(path) or f"asset{ext}"
+        if self.size:
+            return f"{self.id}_{self.size}{ext}"
+        return f"{self.id}{ext}"
+
+    def rendition(self, size: str) -> "Asset":
+        """Get the smallest rendition covering ``size``.
+
+        Args:
+            size (str): minimum ``"{width}x{height}"``.
+
+        Returns:
+            The smallest processed rendition at least as large as ``size``, or the
+            original asset if none is.
+        """
+        width, height = _parse_size(size)
+        best, best_area = self, None
+        for key, asset in self.processed.items():
+            w, h = _parse_size(key)
+            if w >= width and h >= height and (best_area is None or w * h < best_area):
+                best, best_area = asset, w * h
+        return best
 
     async def read(self):
         if not self.url:
             raise TinderException("Invalid asset (no URL)")
+        cache = self._state.asset_cache
+        if cache is not None:
+            return await cache.read(self, self._state.http)
         return await self._state.http.get_asset(self.url)
 
-    async def save(self, fp: Union[str, bytes, os.PathLike, io.BytesIO], *, seek_begin=True):
-        data = await self.read()
+    async def save(
+        self,
+        fp: Union[str, bytes, os.PathLike, io.BytesIO],
+        *,
+        seek_begin=True,
+        resume=False,
+        chunk_size=65536,
+    ):
+        """Save the asset to a buffer or a file.
+
+        Files are streamed to disk chunk by chunk, through a ``.part`` file that
+        is renamed once complete. File I/O runs in a worker thread. The
+        asset's ETag (or Last-Modified) is kept next to the ``.part`` file and
+        sent as ``If-Range`` when resuming, so a changed asset is downloaded
+        again rather than appended to the old bytes.
+
+        Args:
+            fp: a path or a writable :class:`io.BytesIO`.
+            seek_begin (bool): rewind the buffer after writing.
+            resume (bool): continue a leftover ``.part`` file with a range request.
+            chunk_size (int): size of the chunks read from the response.
+
+        Returns:
+            The number of bytes written.
+        """
         if isinstance(fp, io.BytesIO) and fp.writable():
+            data = await self.read()
             wf = fp.write(data)
             if seek_begin:
                 fp.seek(0)
             return wf
-        else:
-            with open(fp, "wb") as f:  # type: ignore
-                return f.write(data)
+        if not self.url:
+            raise TinderException("Invalid asset (no URL)")
+        path = os.fsdecode(fp)  # type: ignore
+        part = path + ".part"
+        offset, validator = 0, None
+        if resume:
+            offset, validator = await asyncio.to_thread(_read_part, part)
+        written = 0
+        while True:
+            async with self._state.http.stream_asset(
+                self.url, offset=offset, if_range=validator
+            ) as resp:
+                if resp.status == 416:
+                    if _complete_length(resp) != offset:
+                        # The part file does not match the asset, start over.
+                        offset, validator = 0, None
+                        continue
+                    break
+                if resp.status == 200:
+                    offset = 0
+                validator = _validator(resp)
+                await asyncio.to_thread(_write_validator, part, validator)
+                f = await asyncio.to_thread(open, part, "ab" if offset else "wb")
+                try:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        written += await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+                break
+        await asyncio.to_thread(os.replace, part, path)
+        await asyncio.to_thread(_write_validator, part, None)
+        return offset + written
 
     def __str__(self):
         return self.url if self.url else ""
@@ -47,3 +151,48 @@ class Asset:
 
     def __repr__(self):
         return "<Asset url={0.url!r}>".format(self)
+
+
+def _parse_size(size: str) -> Tuple[int, int]:
+    width, _, height = size.partition("x")
+    return int(width), int(height)
+
+
+def _read_part(part: str) -> Tuple[int, Optional[str]]:
+    try:
+        offset = os.path.getsize(part)
+    except OSError:
+        return 0, None
+    try:
+        with open(part + ".validator", encoding="utf-8") as f:
+            return offset, f.read() or None
+    except OSError:
+        return offset, None
+
+
+def _write_validator(part: str, validator: Optional[str]) -> None:
+    if validator is None:
+        try:
+            os.remove(part + ".validator")
+        except FileNotFoundError:
+            pass
+    else:
+        with open(part + ".validator", "w", encoding="utf-8") as f:
+            f.write(validator)
+
+
+def _validator(resp) -> Optional[str]:
+    # Weak ETags cannot be used in If-Range.
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def _complete_length(resp) -> Optional[int]:
+    # A 416 carries the full size as "Content-Range: bytes */N".
+    _, _, length = resp.headers.get("Content-Range", "").rpartition("/")
+    try:
+        return int(length)
+    except ValueError:
+        return None
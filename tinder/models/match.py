@@ -0,0 +1,81 @@
+from datetime import datetime
+import logging
+from typing import Optional
+
+from ..iterators import MessageIterator
+from ..state import ConnectionState
+from ..types import MatchPayload
+from ..utils import _parse_time
+from .user import User
+
+log = logging.getLogger(__name__)
+
+
+class Match:
+    __slots__ = (
+        "_state",
+        "id",
+        "created_date",
+        "last_activity_date",
+        "message_count",
+        "closed",
+        "dead",
+        "pending",
+        "is_super_like",
+        "person",
+        "_data",
+    )
+
+    def __init__(self, state: ConnectionState, *, data: MatchPayload):
+        self._state: ConnectionState = state
+        self._update(data)
+
+    def _update(self, data: MatchPayload):
+        self.id: str = data["_id"]
+        self.created_date: Optional[datetime] = _parse_time(data.get("created_date"))
+        self.last_activity_date: Optional[datetime] = _parse_time(data.get("last_activity_date"))
+        self.message_count: int = data.get("message_count", 0)
+        self.closed: bool = data.get("closed", False)
+        self.dead: bool = data.get("dead", False)
+        self.pending: bool = data.get("pending", False)
+        self.is_super_like: bool = data.get("is_super_like", False)
+        self._data: MatchPayload = data
+        person = data.get("person")
+        self.person: Optional[User] = None
+        if person is not None:
+            self.person = self._state.store_user(User(self._state, data=person))
+
+    async def send(self, content: str):
+        """Send a message to the match through the outbox.
+
+        Args:
+            content (str): the message body.
+
+        Returns:
+            The sent :class:`Message`.
+        """
+        return await self._state.outbox.send(self.id, content)
+
+    def messages(self, *, count: int = 100, limit: Optional[int] = None):
+        """Iterate over the match's messages, newest first.
+
+        Args:
+            count (int): messages per page.
+            limit (Optional[int]): stop after this many messages, ``None`` for all.
+
+        Returns:
+            An async iterator of :class:`Message`.
+        """
+        return MessageIterator(
+            self._state, self.id, loop=self._state.loop, count=count, limit=limit
+        )
+
+    async def unmatch(self):
+        log.debug(f"Unmatched {self}")
+        return await self._state.http.unmatch(self.id)
+
+    def __str__(self):
+        return self.person.name if self.person else self.id
+
+    def __repr__(self):
+        return "<Match id={0.id!r} person={0.person!r}>".format(self)
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Optional
+
+from ..state import ConnectionState
+from ..types import MessagePayload
+from ..utils import _parse_time
+
+
+class Message:
+    __slots__ = (
+        "_state",
+        "id",
+        "match_id",
+        "content",
+        "author_id",
+        "recipient_id",
+        "sent_date",
+        "timestamp",
+    )
+
+    def __init__(self, state: ConnectionState, *, data: MessagePayload):
+        self._state: ConnectionState = state
+        self.id: str = data["_id"]
+        self.match_id: str = data["match_id"]
+        self.content: str = data["message"]
+        self.author_id: str = data["from"]
+        self.recipient_id: Optional[str] = data.get("to")
+        self.sent_date: Optional[datetime] = _parse_time(data.get("sent_date"))
+        self.timestamp: Optional[int] = data.get("timestamp")
+
+    @property
+    def match(self):
+        """Optional[:class:`Match`]: The match the message belongs to, if known."""
+        return self._state.get_match(self.match_id)
+
+    def __str__(self):
+        return self.content
+
+    def __repr__(self):
+        return "<Message id={0.id!r} match_id={0.match_id!r}>".format(self)
@@ -1,27 +1,57 @@
 from datetime import datetime
 import logging
+from typing import FrozenSet, List, Optional
 
 from . import abc
 from ..state import ConnectionState
+from ..types import BaseUserPayload, ClientUserPayload, UserPayload
 from .asset import Asset
 
 log = logging.getLogger(__name__)
 
 
 class BaseUser(abc.User):
-    __slots__ = ("_state", "name", "bio", "id", "photos")
+    __slots__ = ("_state", "name", "bio", "id", "_data", "_photos", "_photo_ids")
 
-    def __init__(self, state: ConnectionState, *, data):
+    def __init__(self, state: ConnectionState, *, data: BaseUserPayload):
         self._state: ConnectionState = state
-        BaseUser._update(self, data)
+        self._update(data)
 
     def __str__(self):
         return self.name
 
-    def _update(self, data):
+    def _update(self, data: BaseUserPayload):
         self.name: str = data["name"]
         self.bio: str = data.get("bio", "")
         self.id: str = data["_id"]
+        self._data: BaseUserPayload = data
+        self._photos: Optional[List[Asset]] = None
+        self._photo_ids: Optional[FrozenSet[str]] = None
+
+    @property
+    def photos(self) -> List[Asset]:
+        """List[:class:`Asset`]: The user's photos, built from the payload on first access."""
+        if self._photos is None:
+            photos = self._data.get("photos", [])
+            self._photos = [Asset(self._state, data=photo) for photo in photos]
+        return self._photos
+
+    @property
+    def photo_ids(self) -> FrozenSet[str]:
+        """FrozenSet[:class:`str`]: The ids of the user's photos, read straight from the payload."""
+        if self._photo_ids is None:
+            self._photo_ids = frozenset(photo["id"] for photo in self._data.get("photos", []))
+        return self._photo_ids
+
+    def matches_teaser(self) -> bool:
+        """Check whether one of the user's photos is a known teaser.
+
+        Teasers are indexed by :meth:`tinder.Client.fetch_teasers`.
+
+        Returns:
+            ``True`` if the user is behind one of the indexed teasers.
+        """
+        return self._state.matches_teaser(self.photo_ids)
 
     def __repr__(self):
         return "<User name={0.name!r}>".format(self)
@@ -30,21 +60,32 @@ class BaseUser(abc.User):
 class User(BaseUser):
     __slots__ = BaseUser.__slots__ + ("distance_mi",)
 
-    def __init__(self, state: ConnectionState, *, data):
+    def __init__(self, state: ConnectionState, *, data: UserPayload):
         super().__init__(state, data=data)
-        self._update(data)
 
-    def _update(self, data):
-        self.distance_mi = data["distance_mi"]
-        self.photos = [Asset(self._state, data=photo) for photo in data["photos"]]
+    def _update(self, data: UserPayload):
+        super()._update(data)
+        self.distance_mi: Optional[int] = data.get("distance_mi")
 
     async def like(self):
+        """Like the user.
+
+        Returns:
+            Response data, or ``None`` if a decision on the user is already
+            recorded in the decision journal or state store.
+        """
         log.debug(f"Liked user {self}")
-        await self._state.http.like(self.id)
+        return await self._state.decide(self.id, "like")
 
     async def skip(self):
+        """Pass on the user.
+
+        Returns:
+            Response data, or ``None`` if a decision on the user is already
+            recorded in the decision journal or state store.
+        """
         log.debug(f"Skipped user {self}")
-        await self._state.http.skip(self.id)
+        return await self._state.decide(self.id, "skip")
 
 
 class ClientUser(BaseUser):
@@ -56,14 +97,11 @@ class ClientUser(BaseUser):
         "gender_filter",
     )
 
-    def __init__(self, state: ConnectionState, *, data):
+    def __init__(self, state: ConnectionState, *, data: ClientUserPayload):
         super().__init__(state, data=data)
-        self._update(data)
 
-    def _update(self, data):
-        self.name = data["name"]
-        self.id = data["_id"]
-        self.bio = data.get("bio", "")
+    def _update(self, data: ClientUserPayload):
+        super()._update(data)
         self.birth_date = datetime.strptime(data["birth_date"], "%Y-%m-%dT%H:%M:%S.%fZ")
         self.create_date = datetime.strptime(data["create_date"], "%Y-%m-%dT%H:%M:%S.%fZ")
         self.distance_filter = data["distance_filter"]
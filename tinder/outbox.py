@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+import aiohttp
+
+from .backoff import ExponentialBackoff
+from .errors import HTTPException
+
+log = logging.getLogger(__name__)
+
+_RETRYABLE = (HTTPException, OSError, asyncio.TimeoutError, aiohttp.ClientError)
+
+
+class MessageOutbox:
+    """Queue of outgoing messages.
+
+    Messages to the same match are sent one at a time, in the order they were
+    queued, by a single worker per match that exits once its queue is drained.
+    Sends failing with a 5xx, a connection error or a timeout are retried with
+    backoff. Before each retry the latest messages of the match are checked,
+    so a message that reached the server despite the error is not sent twice.
+
+    The API has no batch endpoint, so queued messages still go out one
+    request each. What a worker shares across its queue is the history
+    snapshot taken before its first send: only messages newer than it, which
+    the worker has not returned already, can be taken for a lost delivery.
+
+    Args:
+        state (:class:`tinder.state.ConnectionState`): state used to send and store messages.
+        max_attempts (int): attempts per message before giving up.
+    """
+
+    def __init__(self, state, *, max_attempts: int = 3) -> None:
+        self.state = state
+        self.max_attempts: int = max_attempts
+        self._queues: Dict[str, Deque[Tuple[str, asyncio.Future]]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    def send(self, match_id: str, content: str) -> asyncio.Future:
+        """Queue a message.
+
+        Returns:
+            A future resolving to the sent :class:`tinder.models.Message`.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._queues.setdefault(match_id, deque())
+        queue.append((content, future))
+        if match_id not in self._workers:
+            self._workers[match_id] = loop.create_task(self._drain(match_id))
+        return future
+
+    def pending(self) -> int:
+        """Number of messages queued or being sent."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been sent or has failed."""
+        while self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stop sending, cancelling the messages still queued."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        for queue in self._queues.values():
+            for _, future in queue:
+                future.cancel()
+        self._queues.clear()
+
+    async def _drain(self, match_id: str) -> None:
+        queue = self._queues[match_id]
+        history: Optional[_History] = None
+        try:
+            while queue:
+                content, future = queue[0]
+                if not future.cancelled():
+                    if history is None:
+                        history = await self._snapshot(match_id)
+                    try:
+                        message = await self._deliver(match_id, content, history)
+                    except Exception as exc:
+                        if not future.done():
+                            future.set_exception(exc)
+                    else:
+                        if not future.done():
+                            future.set_result(message)
+                queue.popleft()
+        finally:
+            del self._workers[match_id]
+            if not queue:
+                self._queues.pop(match_id, None)
+
+    async def _snapshot(self, match_id: str) -> "_History":
+        history = _History()
+        if self.max_attempts < 2:
+            return history
+        client_user = self.state.load_client_user()
+        if client_user is None:
+            # Without our own id a message from the match with the same text
+            # would pass for ours, so deliveries cannot be verified.
+            log.debug("Client user unknown, not checking whether messages are delivered.")
+            return history
+        try:
+            data = await self.state.http.get_messages(match_id, count=20)
+        except _RETRYABLE as exc:
+            log.debug("Could not fetch the messages of %s: %r.", match_id, exc)
+            return history
+        history.author = client_user.id
+        history.since = 0
+        for message_data in data.get("data", {}).get("messages", []):
+            history.seen.add(message_data.get("_id"))
+            timestamp = message_data.get("timestamp")
+            if timestamp is not None:
+                history.since = max(history.since, timestamp)
+        return history
+
+    async def _deliver(self, match_id: str, content: str, history: "_History") -> Any:
+        backoff = ExponentialBackoff(1.0, 30.0)
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(backoff.delay())
+                sent = await self._find_sent(match_id, content, history)
+                if sent is not None:
+                    log.debug("Message to %s was delivered despite the error.", match_id)
+                    return sent
+            try:
+                data = await self.state.http.send_message(match_id, content)
+            except HTTPException as exc:
+                if exc.status < 500 or attempt == self.max_attempts - 1:
+                    raise
+                log.warning("Sending message to %s failed with %s, retrying.", match_id, exc.status)
+            except (OSError, asyncio.TimeoutError, aiohttp.ClientError) as exc:
+                if attempt == self.max_attempts - 1:
+                    raise
+                log.warning("Sending message to %s failed: %r, retrying.", match_id, exc)
+            else:
+                history.seen.add(data.get("_id"))
+                return self.state.store_message(data)
+        raise RuntimeError("max_attempts must be at least 1")
+
+    async def _find_sent(self, match_id: str, content: str, history: "_History") -> Optional[Any]:
+        if history.since is None:
+            return None
+        data = await self.state.http.get_messages(match_id, count=20)
+        for message_data in data.get("data", {}).get("messages", []):
+            if message_data.get("message") != content:
+                continue
+            if message_data.get("from") != history.author:
+                continue
+            if message_data.get("_id") in history.seen:
+                continue
+            timestamp = message_data.get("timestamp")
+            if timestamp is None or timestamp < history.since:
+                continue
+            history.seen.add(message_data["_id"])
+            return self.state.store_message(message_data)
+        return None
+
+
+class _History:
+    """Messages of a match known before an outbox worker's first send."""
+
+    __slots__ = ("author", "since", "seen")
+
+    def __init__(self) -> None:
+        self.author: Optional[str] = None
+        # Timestamp (ms) of the newest message, or None if unverifiable.
+        self.since: Optional[int] = None
+        self.seen: Set[Any] = set()
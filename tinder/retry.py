@@ -0,0 +1,78 @@
+import asyncio
+import random
+from typing import Callable, FrozenSet, Iterator, Optional
+
+import aiohttp
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """How failed requests are retried.
+
+    Delays follow "decorrelated jitter": each delay is drawn between ``base``
+    and three times the previous one, capped at ``cap``, which spreads the
+    retries of many workers hit by the same upstream blip.
+
+    Idempotent requests (GET, PUT, DELETE, ...) are retried on the given
+    statuses, timeouts and dropped connections. Non-idempotent ones (POST,
+    such as likes and passes) are only retried when the request cannot have
+    been processed: failed connection attempts and 503. Pass
+    ``retry_non_idempotent=True`` to treat them like idempotent requests.
+
+    Args:
+        max_attempts (int): attempts per request, including the first one.
+        base (float): smallest delay between attempts, in seconds.
+        cap (float): largest delay between attempts, in seconds.
+        deadline (Optional[float]): total seconds a request may take across
+            attempts and delays, ``None`` for no limit.
+        timeout (Optional[aiohttp.ClientTimeout]): timeout of each attempt.
+        statuses (FrozenSet[int]): statuses retried for idempotent requests.
+        retry_non_idempotent (bool): retry non-idempotent requests like idempotent ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base: float = 0.5,
+        cap: float = 30.0,
+        deadline: Optional[float] = 60.0,
+        timeout: Optional[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(total=30.0),
+        statuses: FrozenSet[int] = frozenset({500, 502, 503, 504}),
+        retry_non_idempotent: bool = False,
+        rand: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts: int = max_attempts
+        self.base: float = base
+        self.cap: float = cap
+        self.deadline: Optional[float] = deadline
+        self.timeout: Optional[aiohttp.ClientTimeout] = timeout
+        self.statuses: FrozenSet[int] = statuses
+        self.retry_non_idempotent: bool = retry_non_idempotent
+        self._rand: Callable[[float, float], float] = rand
+
+    def delays(self) -> Iterator[float]:
+        """Yield the delays before each retry of one request."""
+        delay = self.base
+        while True:
+            delay = min(self.cap, self._rand(self.base, delay * 3))
+            yield delay
+
+    def should_retry_status(self, method: str, status: int) -> bool:
+        if method in IDEMPOTENT_METHODS or self.retry_non_idempotent:
+            return status in self.statuses
+        return status == 503
+
+    def should_retry_error(self, method: str, exc: BaseException) -> bool:
+        if isinstance(exc, aiohttp.ClientConnectorError):
+            # The connection was never established, so nothing was sent.
+            return True
+        if method in IDEMPOTENT_METHODS or self.retry_non_idempotent:
+            return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+        return False
+
+    def __repr__(self):
+        return "<RetryPolicy max_attempts={0.max_attempts} deadline={0.deadline}>".format(self)
@@ -1,4 +1,12 @@
 import gc
+import logging
+from collections import OrderedDict
+
+from .outbox import MessageOutbox
+from .store import StateChanges
+from .utils import LRUCache
+
+log = logging.getLogger(__name__)
 
 
 class ConnectionState:
@@ -8,12 +16,36 @@ class ConnectionState:
         self.dispatch = dispatch
         self.handlers = handlers
         self.heartbeat_timeout = options.get("heartbeat_timeout", 60.0)
+        self.max_users = options.get("max_users", 1000)
+        self.user_ttl = options.get("user_ttl", 3600.0)
+        self.asset_cache = options.get("asset_cache")
+        self.user_columns = options.get("user_columns")
+        if self.user_columns is not None and self.user_columns.state is None:
+            self.user_columns.state = self
+        self.max_teasers = options.get("max_teasers", 10000)
+        self.teaser_ttl = options.get("teaser_ttl", 24 * 3600.0)
+        self.max_message_matches = options.get("max_message_matches", 200)
+        self.max_messages = options.get("max_messages", 100)
+        self.outbox = MessageOutbox(self, max_attempts=options.get("message_attempts", 3))
+        self.state_store = options.get("state_store")
+        self.decision_journal = options.get("decision_journal")
+        self._deciding = set()
+        self._changes = StateChanges.empty()
+        self._reset()
+        if self.state_store is not None:
+            self.last_activity_date = self.state_store.get_meta("last_activity_date") or ""
 
-    def clear(self):
+    def _reset(self):
         self.client_user = None
-        self._users = {}
-        self._teasers = {}
-        self._messages = []
+        self.last_activity_date = ""
+        self._matches = {}
+        self._users = LRUCache(self.max_users, self.user_ttl)
+        self._teasers = LRUCache(self.max_teasers, self.teaser_ttl)
+        self._messages = LRUCache(self.max_message_matches)
+
+    def clear(self):
+        """Drop every cached object and collect the garbage they leave."""
+        self._reset()
         gc.collect()
 
     def call_handlers(self, key, *args, **kwargs):
@@ -24,9 +56,210 @@ class ConnectionState:
         else:
             func(*args, **kwargs)
 
+    def parse_gateway_message(self, message):
+        if message.is_heartbeat:
+            self.call_handlers("heartbeat_ack")
+            return
+        self.dispatch("gateway_message", message)
+        self.call_handlers("nudge", message)
+
+    def parse_updates(self, data):
+        """Apply an ``/updates`` delta and advance the cursor.
+
+        Returns:
+            Whether the delta contained any change.
+        """
+        changed = False
+        for match_data in data.get("matches", []):
+            changed = True
+            match_id = match_data["_id"]
+            if match_data.get("closed") or match_data.get("dead"):
+                removed = self._remove_match(match_id)
+                if removed is not None:
+                    self.dispatch("match_remove", removed)
+                continue
+            is_new = self.get_match(match_id) is None
+            match = self.store_match(match_data)
+            if is_new:
+                self.dispatch("match", match)
+            for message_data in match_data.get("messages", []):
+                self.dispatch("message", self.store_message(message_data))
+        for match_id in data.get("blocks", []):
+            changed = True
+            self._remove_match(match_id)
+            self.dispatch("block", match_id)
+        cursor = data.get("last_activity_date")
+        if cursor and cursor != self.last_activity_date:
+            self.last_activity_date = cursor
+            if self.state_store is not None:
+                self._changes.meta["last_activity_date"] = cursor
+        return changed
+
+    def get_match(self, match_id):
+        match = self._matches.get(match_id)
+        if match is None and self.state_store is not None:
+            data = self.state_store.get_match(match_id)
+            if data is not None and match_id not in self._changes.removed_matches:
+                from .models.match import Match
+
+                match = self._matches[match_id] = Match(self, data=data)
+        return match
+
+    def store_match(self, data):
+        """Store a match payload, merging it into the known match if there is one."""
+        from .models.match import Match
+
+        match = self.get_match(data["_id"])
+        if match is None:
+            match = Match(self, data=data)
+            self._matches[match.id] = match
+        else:
+            match._update({**match._data, **data})
+        if self.state_store is not None:
+            self._changes.matches[match.id] = match._data
+            self._changes.removed_matches.discard(match.id)
+        return match
+
+    def _remove_match(self, match_id):
+        # Look the match up first so one only known to the store is found too.
+        removed = self.get_match(match_id)
+        self._matches.pop(match_id, None)
+        if self.state_store is not None:
+            self._changes.matches.pop(match_id, None)
+            self._changes.removed_matches.add(match_id)
+        return removed
+
+    def store_message(self, data):
+        """Store a message in the history cache of its match."""
+        from .models.message import Message
+
+        message = Message(self, data=data)
+        history = self._messages.get(message.match_id)
+        if history is None:
+            history = OrderedDict()
+            self._messages[message.match_id] = history
+        history[message.id] = message
+        while len(history) > self.max_messages:
+            history.popitem(last=False)
+        return message
+
+    def get_messages(self, match_id):
+        """Get the cached messages of a match, oldest first."""
+        history = self._messages.get(match_id)
+        if history is None:
+            return []
+        return sorted(history.values(), key=lambda m: m.timestamp or 0)
+
+    def get_user(self, user_id):
+        user = self._users.get(user_id)
+        if user is None and self.state_store is not None:
+            data = self.state_store.get_user(user_id)
+            if data is not None:
+                from .models.user import User
+
+                user = self._users[user_id] = User(self, data=data)
+        return user
+
     def store_user(self, user):
-        try:
-            return self._users[user.id]
-        except KeyError:
+        """Store a user, returning the cached instance updated with its payload if known."""
+        if self.user_columns is not None:
+            self.user_columns.add(user)
+        if self.state_store is not None:
+            self._changes.users[user.id] = user._data
+        cached = self._users.peek(user.id)
+        if cached is None or type(cached) is not type(user):
             self._users[user.id] = user
             return user
+        cached._update(user._data)
+        self._users[user.id] = cached
+        return cached
+
+    def store_client_user(self, data):
+        from .models.user import ClientUser
+
+        self.client_user = ClientUser(self, data=data)
+        if self.state_store is not None:
+            self._changes.meta["profile"] = data
+        return self.client_user
+
+    def load_client_user(self):
+        """Get the client user, restoring it from the state store if it is not known yet."""
+        if self.client_user is None and self.state_store is not None:
+            data = self.state_store.get_meta("profile")
+            if data is not None:
+                from .models.user import ClientUser
+
+                self.client_user = ClientUser(self, data=data)
+        return self.client_user
+
+    def record_decision(self, user_id, action):
+        """Remember that a user was liked or skipped."""
+        if self.decision_journal is not None:
+            self.decision_journal.record(user_id, action)
+        if self.state_store is not None:
+            self._changes.decisions[user_id] = action
+
+    def get_decision(self, user_id):
+        """Get the recorded decision on a user, ``"like"``, ``"skip"`` or ``None``."""
+        if self.decision_journal is not None:
+            decision = self.decision_journal.get(user_id)
+            if decision is not None:
+                return decision
+        decision = self._changes.decisions.get(user_id)
+        if decision is None and self.state_store is not None:
+            decision = self.state_store.get_decision(user_id)
+        return decision
+
+    async def decide(self, user_id, action):
+        """Like or skip a user, unless this decision is already recorded or one is being sent.
+
+        A recorded decision can be changed, so a skipped user can still be liked.
+
+        Returns:
+            Response data, or ``None`` if the decision was not sent.
+        """
+        if user_id in self._deciding or self.get_decision(user_id) == action:
+            log.debug("Already decided on user %s, not sending %s.", user_id, action)
+            return None
+        self._deciding.add(user_id)
+        try:
+            data = await getattr(self.http, action)(user_id)
+        finally:
+            self._deciding.discard(user_id)
+        self.record_decision(user_id, action)
+        return data
+
+    async def checkpoint(self):
+        """Write the changes made since the last checkpoint to the state store."""
+        if self.state_store is None or not self._changes:
+            return
+        changes, self._changes = self._changes, StateChanges.empty()
+        try:
+            await self.state_store.write(changes)
+        except BaseException:
+            self._changes.merge_older(changes)
+            raise
+
+    def store_teasers(self, teasers):
+        """Index teaser photos by id, renewing the ones seen again and dropping expired ones."""
+        for teaser in teasers:
+            self._teasers[teaser.id] = teaser
+        self._teasers.expire()
+
+    def get_teaser(self, photo_id):
+        return self._teasers.get(photo_id)
+
+    def matches_teaser(self, photo_ids):
+        """Check whether any of the photo ids belongs to a known teaser."""
+        teasers = self._teasers
+        return any(teasers.peek(photo_id) is not None for photo_id in photo_ids)
+
+    def cache_stats(self):
+        stats = {
+            "users": self._users.stats(),
+            "teasers": self._teasers.stats(),
+            "messages": self._messages.stats(),
+        }
+        if self.asset_cache is not None:
+            stats["assets"] = self.asset_cache.stats()
+        return stats
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set
+
+from .utils import _from_json
+
+log = logging.getLogger(__name__)
+
+
+class StateChanges(NamedTuple):
+    """Changes to the state since the last checkpoint.
+
+    Attributes:
+        users: user payloads by id.
+        matches: match payloads by id.
+        removed_matches: ids of the matches that were removed.
+        decisions: ``"like"`` or ``"skip"`` by user id.
+        meta: other values, such as the sync cursor and the profile.
+    """
+
+    users: Dict[str, Dict[str, Any]]
+    matches: Dict[str, Dict[str, Any]]
+    removed_matches: Set[str]
+    decisions: Dict[str, str]
+    meta: Dict[str, Any]
+
+    @classmethod
+    def empty(cls) -> "StateChanges":
+        return cls({}, {}, set(), {}, {})
+
+    def __bool__(self) -> bool:
+        return any(len(field) for field in self)
+
+    def merge_older(self, older: "StateChanges") -> None:
+        """Add changes from an earlier, unsaved checkpoint without overriding newer ones."""
+        for key, data in older.users.items():
+            self.users.setdefault(key, data)
+        for key, data in older.matches.items():
+            if key not in self.removed_matches:
+                self.matches.setdefault(key, data)
+        self.removed_matches.update(older.removed_matches.difference(self.matches))
+        for key, action in older.decisions.items():
+            self.decisions.setdefault(key, action)
+        for key, value in older.meta.items():
+            self.meta.setdefault(key, value)
+
+
+class StateStore:
+    """Persistent storage for :class:`tinder.state.ConnectionState`.
+
+    Lookups are made synchronously, on the event loop, when the state misses
+    an object in memory; they should be fast. Writes are batched by the state
+    and handed over on each checkpoint. This base class stores nothing.
+    """
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def get_match(self, match_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def get_decision(self, user_id: str) -> Optional[str]:
+        return None
+
+    def get_meta(self, key: str) -> Any:
+        return None
+
+    async def write(self, changes: StateChanges) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteStateStore(StateStore):
+    """A :class:`StateStore` backed by a SQLite database.
+
+    Payloads are stored as JSON. Checkpoints are encoded and written in a
+    single transaction on a worker thread; lookups use a separate connection
+    and do not wait for them.
+
+    Args:
+        path: database file, created if missing.
+        loads (Callable): JSON decoder for the stored payloads.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS matches (id TEXT PRIMARY KEY, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS decisions (user_id TEXT PRIMARY KEY, action TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+
+    def __init__(
+        self, path: "os.PathLike[str] | str", *, loads: Callable[[Any], Any] = _from_json
+    ) -> None:
+        self.path: str = os.fspath(path)
+        self.loads: Callable[[Any], Any] = loads
+        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._writer.execute(statement)
+        # Lookups run on the event loop through their own connection: in WAL
+        # mode they read the last committed state without waiting for a
+        # checkpoint being written. An in-memory database cannot be shared
+        # between connections, so it gets a single one.
+        self._reader: Optional[sqlite3.Connection] = (
+            self._writer if self.path == ":memory:" else self._connect()
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+
+    def _get(self, query: str, key: str) -> Optional[str]:
+        if self._reader is None:
+            return None
+        row = self._reader.execute(query, (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _get_json(self, query: str, key: str) -> Any:
+        value = self._get(query, key)
+        return None if value is None else self.loads(value)
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._get_json("SELECT data FROM users WHERE id = ?", user_id)
+
+    def get_match(self, match_id: str) -> Optional[Dict[str, Any]]:
+        return self._get_json("SELECT data FROM matches WHERE id = ?", match_id)
+
+    def get_decision(self, user_id: str) -> Optional[str]:
+        return self._get("SELECT action FROM decisions WHERE user_id = ?", user_id)
+
+    def get_meta(self, key: str) -> Any:
+        return self._get_json("SELECT value FROM meta WHERE key = ?", key)
+
+    def _write(self, changes: StateChanges) -> None:
+        dumps = json.dumps
+        users = [(key, dumps(data)) for key, data in changes.users.items()]
+        matches = [(key, dumps(data)) for key, data in changes.matches.items()]
+        removed = [(key,) for key in changes.removed_matches]
+        decisions = list(changes.decisions.items())
+        meta = [(key, dumps(value)) for key, value in changes.meta.items()]
+        with self._write_lock:
+            db = self._writer
+            if db is None:
+                return
+            with db:
+                db.execute("BEGIN")
+                db.executemany("INSERT OR REPLACE INTO users VALUES (?, ?)", users)
+                db.executemany("INSERT OR REPLACE INTO matches VALUES (?, ?)", matches)
+                db.executemany("DELETE FROM matches WHERE id = ?", removed)
+                db.executemany("INSERT OR REPLACE INTO decisions VALUES (?, ?)", decisions)
+                db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta)
+
+    def _close(self) -> None:
+        with self._write_lock:
+            for db in {self._reader, self._writer}:
+                if db is not None:
+                    db.close()
+            self._reader = self._writer = None
+
+    async def write(self, changes: StateChanges) -> None:
+        await asyncio.to_thread(self._write, changes)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Coroutine, Optional, Set
+
+log = logging.getLogger(__name__)
+
+
+class TaskSupervisor:
+    """Keeps references to the client's background tasks.
+
+    Tracked tasks cannot be garbage collected while running, their failures
+    are logged instead of being reported as never retrieved, and they can be
+    awaited or cancelled together on shutdown.
+
+    Args:
+        loop: the event loop the tasks run on.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def spawn(self, coro: Coroutine, *, name: Optional[str] = None) -> asyncio.Task:
+        """Run a coroutine as a tracked task."""
+        return self.track(self.loop.create_task(coro, name=name))
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Track an existing task until it is done."""
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            log.error("Background task %s failed.", task.get_name(), exc_info=exc)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the tracked tasks, including any they start meanwhile.
+
+        Args:
+            timeout (Optional[float]): seconds to wait at most.
+
+        Returns:
+            Whether every task finished in time.
+        """
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while self._tasks:
+            remaining = None if deadline is None else deadline - self.loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(set(self._tasks), timeout=remaining)
+        return True
+
+    async def cancel(self) -> None:
+        """Cancel the tracked tasks and wait for them to finish."""
+        tasks = set(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+from .backoff import ExponentialBackoff
+from .errors import HTTPException
+
+log = logging.getLogger(__name__)
+
+
+class SyncEngine:
+    """Keeps :class:`tinder.state.ConnectionState` in sync through ``/updates``.
+
+    Each sync sends the ``last_activity_date`` cursor and applies the returned
+    delta, dispatching ``match``, ``match_remove``, ``message`` and ``block``
+    events. While the gateway is connected the engine syncs when the gateway
+    nudges it and otherwise only every ``gateway_interval`` seconds. Without a
+    gateway it polls, starting at ``interval`` seconds (or the interval the
+    server asks for) and doubling up to ``max_interval`` while nothing changes.
+
+    Args:
+        client (:class:`tinder.Client`): the client to sync.
+        interval (float): polling interval after a change, in seconds.
+        max_interval (float): longest polling interval, in seconds.
+        gateway_interval (float): fallback interval while the gateway is up.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        interval: float = 30.0,
+        max_interval: float = 300.0,
+        gateway_interval: float = 600.0,
+    ) -> None:
+        self.client = client
+        self.interval: float = interval
+        self.max_interval: float = max_interval
+        self.gateway_interval: float = gateway_interval
+        self._current: float = interval
+        self._nudged: asyncio.Event = asyncio.Event()
+
+    def nudge(self, *args) -> None:
+        """Ask for a sync as soon as possible."""
+        self._nudged.set()
+
+    async def sync(self) -> bool:
+        """Fetch and apply one delta.
+
+        Returns:
+            Whether anything changed.
+        """
+        state = self.client._connection
+        data = await self.client.http.update(state.last_activity_date)
+        changed = state.parse_updates(data)
+        server_interval = data.get("poll_interval", {}).get("standard")
+        if server_interval:
+            self.interval = max(self.interval, server_interval / 1000)
+        return changed
+
+    def _next_interval(self, changed: bool) -> float:
+        if self.client.ws.is_open():
+            return self.gateway_interval
+        if changed:
+            self._current = self.interval
+        else:
+            self._current = min(self._current * 2, self.max_interval)
+        return self._current
+
+    async def _wait(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._nudged.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        backoff = ExponentialBackoff(self.interval, self.max_interval)
+        while not self.client.is_closed():
+            self._nudged.clear()
+            delay: Optional[float] = None
+            try:
+                changed = await self.sync()
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                aiohttp.ClientError,
+                HTTPException,
+                ValueError,
+            ) as exc:
+                delay = backoff.delay()
+                log.warning("Sync failed: %r, retrying in %.2f seconds.", exc, delay)
+            except Exception:
+                delay = backoff.delay()
+                log.exception("Unexpected error while syncing, retrying in %.2f seconds.", delay)
+            else:
+                backoff.reset()
+                delay = self._next_interval(changed)
+                await self.client.checkpoint()
+            await self._wait(delay)
@@ -1,5 +1,69 @@
-from typing import TypedDict
+from typing import Any, Dict, List, TypedDict
 
-# TODO: Payload
-class UserPayload(TypedDict):
-    ...
+
+class ProcessedFilePayload(TypedDict):
+    url: str
+    width: int
+    height: int
+
+
+class _PhotoPayloadOptional(TypedDict, total=False):
+    fileName: str
+    extension: str
+
+
+class PhotoPayload(_PhotoPayloadOptional):
+    id: str
+    url: str
+    processedFiles: List[ProcessedFilePayload]
+
+
+class _BaseUserPayloadOptional(TypedDict, total=False):
+    bio: str
+    photos: List[PhotoPayload]
+
+
+class BaseUserPayload(_BaseUserPayloadOptional):
+    _id: str
+    name: str
+
+
+class UserPayload(BaseUserPayload):
+    distance_mi: int
+
+
+class ClientUserPayload(BaseUserPayload):
+    birth_date: str
+    create_date: str
+    distance_filter: int
+    gender: int
+    gender_filter: int
+
+
+class _MatchPayloadOptional(TypedDict, total=False):
+    created_date: str
+    last_activity_date: str
+    message_count: int
+    messages: List[Dict[str, Any]]
+    closed: bool
+    dead: bool
+    pending: bool
+    is_super_like: bool
+    person: BaseUserPayload
+
+
+class MatchPayload(_MatchPayloadOptional):
+    _id: str
+
+
+# "from" is a keyword, so the required keys use the functional syntax.
+_MessagePayloadRequired = TypedDict(
+    "_MessagePayloadRequired",
+    {"_id": str, "match_id": str, "message": str, "from": str},
+)
+
+
+class MessagePayload(_MessagePayloadRequired, total=False):
+    to: str
+    sent_date: str
+    timestamp: int
@@ -1,4 +1,39 @@
+import asyncio
 import datetime
+import json
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+try:
+    import msgspec
+except ModuleNotFoundError:
+    HAS_MSGSPEC = False
+else:
+    HAS_MSGSPEC = True
 
 TINDERPY_EPOCH = 1420070400000
 
@@ -6,3 +41,217 @@ TINDERPY_EPOCH = 1420070400000
 def snowflake_time(id):
     """Returns the creation date in UTC of a snowflake ID."""
     return datetime.datetime.utcfromtimestamp(((id >> 22) + TINDERPY_EPOCH) / 1000)
+
+
+def _from_json(data):
+    """Decode a JSON document from :class:`bytes` or :class:`str`.
+
+    Uses orjson or msgspec when installed and falls back to the standard library.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if HAS_MSGSPEC:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse an API timestamp such as ``2022-06-23T00:00:00.000Z``."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_retry_after(value, *, default):
+    """Parse a ``Retry-After`` style header value (in seconds), falling back to ``default``."""
+    if value is None:
+        return float(default)
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return float(default)
+
+
+T = TypeVar("T")
+
+
+async def _bounded_as_completed(
+    func: Callable[[T], Awaitable[Any]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    *,
+    concurrency: int,
+) -> AsyncIterator[Tuple[T, Any]]:
+    """Run ``func`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    Yields ``(item, result)`` in completion order, where ``result`` is the
+    exception raised by ``func`` if it failed.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    done = object()
+    errors: List[BaseException] = []
+
+    async def feed():
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await pending.put(item)
+            else:
+                for item in items:
+                    await pending.put(item)
+        except Exception as exc:
+            errors.append(exc)
+        for _ in range(concurrency):
+            await pending.put(done)
+
+    async def worker():
+        this = asyncio.current_task()
+        try:
+            while True:
+                item = await pending.get()
+                if item is done:
+                    return
+                try:
+                    result = await func(item)
+                except Exception as exc:
+                    result = exc
+                except asyncio.CancelledError as exc:
+                    # Only the consumer cancels the workers; a cancellation
+                    # coming from ``func`` itself is that item's result.
+                    cancelling = getattr(this, "cancelling", None)
+                    if closing or (cancelling is not None and cancelling()):
+                        raise
+                    result = exc
+                results.put_nowait((item, result))
+        finally:
+            # Always signal the consumer, even if the worker is cancelled.
+            results.put_nowait(done)
+
+    closing = False
+    tasks = [loop.create_task(feed())]
+    tasks.extend(loop.create_task(worker()) for _ in range(concurrency))
+    try:
+        finished = 0
+        while finished < concurrency:
+            item = await results.get()
+            if item is done:
+                finished += 1
+            else:
+                yield item
+    finally:
+        closing = True
+        for task in tasks:
+            task.cancel()
+    if errors:
+        raise errors[0]
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of a cache's counters."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class LRUCache(Generic[K, V]):
+    """A size capped mapping with least recently used eviction and optional expiry.
+
+    Args:
+        max_size (int): maximum number of entries kept.
+        ttl (Optional[float]): seconds an entry stays valid, ``None`` to never expire.
+    """
+
+    __slots__ = ("max_size", "ttl", "hits", "misses", "_data", "_clock")
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+        self._clock: Callable[[], float] = clock
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if expires_at < self._clock():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """Get a live entry without touching the counters or the eviction order."""
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return None
+        return value if expires_at >= self._clock() else None
+
+    def __setitem__(self, key: K, value: V) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            expires_at, _ = self._data[key]  # type: ignore
+        except KeyError:
+            return False
+        return expires_at >= self._clock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        try:
+            return self._data.pop(key)[1]
+        except KeyError:
+            return default
+
+    def expire(self) -> int:
+        """Drop every expired entry, returning how many were dropped."""
+        now = self._clock()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+    def values(self) -> Iterator[V]:
+        now = self._clock()
+        return (value for expires_at, value in list(self._data.values()) if expires_at >= now)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, len(self._data), self.max_size)